@@ -0,0 +1,42 @@
+"""Per-user task counters.
+
+Revision ID: 20261018_002
+Revises: 20260217_001
+Create Date: 2026-10-18 09:12:40
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_002"
+down_revision: Union[str, None] = "20260217_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counters",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("priority", sa.String(length=10), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("owner_id", "status", "priority", "is_archived"),
+    )
+    op.execute(
+        """
+        INSERT INTO task_counters (owner_id, status, priority, is_archived, count)
+        SELECT owner_id, coalesce(status, 'pending'), coalesce(priority, 'medium'), coalesce(is_archived, false), count(*)
+        FROM tasks
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_counters")
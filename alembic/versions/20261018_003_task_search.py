@@ -0,0 +1,38 @@
+"""Full-text search over task title and description.
+
+Revision ID: 20261018_003
+Revises: 20261018_002
+Create Date: 2026-10-18 14:05:21
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261018_003"
+down_revision: Union[str, None] = "20261018_002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+    # Built without blocking writes; the column add above already rewrote the table once.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_search_vector", "tasks", ["search_vector"], unique=False, postgresql_using="gin", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_search_vector", table_name="tasks", postgresql_concurrently=True)
+    op.drop_column("tasks", "search_vector")
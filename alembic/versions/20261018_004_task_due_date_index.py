@@ -0,0 +1,34 @@
+"""Partial index over due dates of open tasks.
+
+Revision ID: 20261018_004
+Revises: 20261018_003
+Create Date: 2026-10-18 16:40:02
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_004"
+down_revision: Union[str, None] = "20261018_003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_due_date_open",
+            "tasks",
+            ["due_date"],
+            unique=False,
+            postgresql_where=sa.text("due_date IS NOT NULL AND status <> 'completed' AND NOT is_archived"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_due_date_open", table_name="tasks", postgresql_concurrently=True)
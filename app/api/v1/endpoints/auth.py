@@ -2,8 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, EmailStr
-from app.core.database import get_db
-from app.core.security import verify_password, hash_password, create_access_token, create_refresh_token, decode_token
+from app.core.database import get_db, mark_recent_write, pipeline_after_commit
+from app.core.dependencies import USERS_NAMESPACE
+from app.core.redis_client import CachePipeline
+from app.core.security import verify_password_async, hash_password_async, create_access_token, create_refresh_token, decode_token
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 
@@ -33,10 +35,16 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     if existing:
         field = "email" if existing.email == user_in.email else "username"
         raise HTTPException(status_code=400, detail=f"{field} already registered")
-    user = User(email=user_in.email, username=user_in.username, full_name=user_in.full_name, hashed_password=hash_password(user_in.password), role="user")
+    user = User(email=user_in.email, username=user_in.username, full_name=user_in.full_name, hashed_password=await hash_password_async(user_in.password), role="user")
     db.add(user)
     await db.flush()
     await db.refresh(user)
+
+    def queue(pipe: CachePipeline):
+        pipe.bump_version(USERS_NAMESPACE)
+        mark_recent_write(pipe, user.id)
+
+    pipeline_after_commit(db, queue)
     return user
 
 
@@ -44,7 +52,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == credentials.email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is deactivated")
@@ -1,91 +1,482 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+import csv
+import hashlib
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.core.redis_client import redis_client
+from sqlalchemy import select, func, and_, tuple_, insert, update
+from app.core.database import get_db, pipeline_after_commit, read_session, replica_router
+from app.core.dependencies import get_current_principal, get_read_db
+from app.core.redis_client import CachePipeline, redis_client
 from app.core.config import settings
 from app.models.task import Task
-from app.models.user import User
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
+from app.models.task_counter import TaskCounter
+from app.schemas.task import (
+    BulkItemError,
+    TaskBulkArchive,
+    TaskBulkResponse,
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskListResponse,
+    TaskResponse,
+    TaskStatsResponse,
+    TaskUpdate,
+)
+from app.schemas.user import CurrentUser
+from app.services.task_service import (
+    COUNTER_BUCKET_COLUMNS,
+    apply_counter_deltas,
+    counter_bucket,
+    invalidate_task_caches,
+    record_task_events,
+    schedule_reminders,
+    search_tasks_query,
+    task_cache_key,
+    task_stream_key,
+    tasks_namespace,
+    unschedule_reminders,
+)
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, estimate_count
+from app.utils.responses import cached_response, encode_body, etag_matches, make_etag, not_modified
+from app.utils.sse import EventStreamResponse, StreamSlots, sse_comment, sse_frame, stream_id_key
 
 router = APIRouter()
 
+stream_slots = StreamSlots(settings.SSE_MAX_STREAMS)
+
 
 @router.get("/", response_model=TaskListResponse)
 async def list_tasks(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     status: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     archived: bool = Query(False),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="`cursor` switches to keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque `next_cursor` from the previous page; implies `pagination=cursor`"),
+    count: str = Query("exact", pattern="^(exact|estimate|none)$", description="Exact `total`, planner estimate, or none"),
+    current_user: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    cache_key = f"tasks:user:{current_user.id}:p{page}:pp{per_page}:s{status}:pr{priority}:a{archived}"
-    cached = await redis_client.get(cache_key)
-    if cached:
-        return cached
+    keyset = pagination == "cursor" or cursor is not None
+    after = None
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor, 2)
+            after = (datetime.fromisoformat(created_at), int(last_id))
+        except (InvalidCursor, TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    position = f"c{cursor or ''}" if keyset else f"p{page}"
+    version = await redis_client.get_version(tasks_namespace(current_user.id))
+    cache_key = f"tasks:user:{current_user.id}:v{version}:{position}:pp{per_page}:s{status}:pr{priority}:a{archived}:n{count}"
+
+    async def load() -> dict:
+        conditions = [Task.owner_id == current_user.id, Task.is_archived == archived]
+        counter_conditions = [TaskCounter.owner_id == current_user.id, TaskCounter.is_archived == archived]
+        if status:
+            conditions.append(Task.status == status)
+            counter_conditions.append(TaskCounter.status == status)
+        if priority:
+            conditions.append(Task.priority == priority)
+            counter_conditions.append(TaskCounter.priority == priority)
+
+        total = None
+        if count == "exact":
+            # At most one counter row per status/priority pair, however many tasks the user has.
+            total = (await db.execute(select(func.coalesce(func.sum(TaskCounter.count), 0)).where(*counter_conditions))).scalar()
+        elif count == "estimate":
+            total = await estimate_count(db, select(Task.id).where(and_(*conditions)))
+
+        query = select(Task).where(and_(*conditions)).order_by(Task.created_at.desc(), Task.id.desc())
+        next_cursor = None
+        if keyset:
+            if after:
+                query = query.where(tuple_(Task.created_at, Task.id) < after)
+            tasks = (await db.execute(query.limit(per_page + 1))).scalars().all()
+            if len(tasks) > per_page:
+                tasks = tasks[:per_page]
+                next_cursor = encode_cursor(tasks[-1].created_at.isoformat(), tasks[-1].id)
+        else:
+            tasks = (await db.execute(query.offset((page - 1) * per_page).limit(per_page))).scalars().all()
+
+        return encode_body(
+            TaskListResponse(
+                tasks=[TaskResponse.model_validate(t) for t in tasks],
+                total=total,
+                page=None if keyset else page,
+                per_page=per_page,
+                pages=-(-total // per_page) if total is not None else None,
+                next_cursor=next_cursor,
+            )
+        )
+
+    entry = await redis_client.get_or_load(cache_key, load, ttl=settings.CACHE_TTL_MEDIUM, stale_ttl=settings.CACHE_STALE_TTL)
+    # The ETag hashes the cached body, so a write that leaves this page unchanged still revalidates with a 304.
+    if etag_matches(request, entry["etag"]):
+        return not_modified(entry["etag"])
+    return cached_response(entry)
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def task_stats(request: Request, current_user: CurrentUser = Depends(get_current_principal), db: AsyncSession = Depends(get_read_db)):
+    """Task totals by status and priority, read from the maintained counters rather than the tasks table."""
+    version = await redis_client.get_version(tasks_namespace(current_user.id))
+    cache_key = f"tasks:user:{current_user.id}:v{version}:stats"
+
+    async def load() -> dict:
+        stmt = select(TaskCounter.status, TaskCounter.priority, TaskCounter.is_archived, TaskCounter.count).where(
+            TaskCounter.owner_id == current_user.id, TaskCounter.count > 0
+        )
+        stats = TaskStatsResponse(total=0, archived=0, by_status={}, by_priority={})
+        for status, priority, is_archived, task_count in await db.execute(stmt):
+            if is_archived:
+                stats.archived += task_count
+                continue
+            stats.total += task_count
+            stats.by_status[status] = stats.by_status.get(status, 0) + task_count
+            stats.by_priority[priority] = stats.by_priority.get(priority, 0) + task_count
+        return encode_body(stats)
+
+    entry = await redis_client.get_or_load(cache_key, load, ttl=settings.CACHE_TTL_MEDIUM, stale_ttl=settings.CACHE_STALE_TTL)
+    if etag_matches(request, entry["etag"]):
+        return not_modified(entry["etag"])
+    return cached_response(entry)
+
+
+@router.get("/search", response_model=TaskListResponse)
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words, \"quoted phrases\", `or` and `-excluded` terms"),
+    per_page: int = Query(20, ge=1, le=100),
+    archived: bool = Query(False),
+    cursor: Optional[str] = Query(None, description="Opaque `next_cursor` from the previous page"),
+    current_user: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Full-text search over title and description, ranked by relevance and keyset-paginated."""
+    after = None
+    if cursor:
+        try:
+            rank, last_id = decode_cursor(cursor, 2)
+            after = (float(rank), int(last_id))
+        except (InvalidCursor, TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    version = await redis_client.get_version(tasks_namespace(current_user.id))
+    query_hash = hashlib.blake2b(q.encode(), digest_size=8).hexdigest()
+    cache_key = f"tasks:user:{current_user.id}:v{version}:search:{query_hash}:c{cursor or ''}:pp{per_page}:a{archived}"
+
+    async def load() -> dict:
+        rows = (await db.execute(search_tasks_query(current_user.id, q, archived, after).limit(per_page + 1))).all()
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].Task.id)
+        tasks = [TaskResponse.model_validate(row.Task) for row in rows]
+        return encode_body(TaskListResponse(tasks=tasks, per_page=per_page, next_cursor=next_cursor))
 
+    entry = await redis_client.get_or_load(cache_key, load, ttl=settings.CACHE_TTL_SHORT, stale_ttl=settings.CACHE_STALE_TTL)
+    if etag_matches(request, entry["etag"]):
+        return not_modified(entry["etag"])
+    return cached_response(entry)
+
+
+@router.get("/export")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    archived: bool = Query(False),
+    current_user: CurrentUser = Depends(get_current_principal),
+):
+    """Stream every matching task in constant memory, bypassing the cache."""
     conditions = [Task.owner_id == current_user.id, Task.is_archived == archived]
     if status:
         conditions.append(Task.status == status)
     if priority:
         conditions.append(Task.priority == priority)
+    query = select(Task).where(and_(*conditions)).order_by(Task.id).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    columns = list(TaskResponse.model_fields)
+
+    async def rows():
+        # Request-scoped sessions are closed before the body is sent, so the stream owns its session.
+        async with replica_router.use(await read_session(current_user.id)) as session:
+            if format == "csv":
+                yield _csv_chunk([columns])
+            result = await session.stream_scalars(query)
+            async for batch in result.partitions():
+                if format == "csv":
+                    yield _csv_chunk([TaskResponse.model_validate(t).model_dump(mode="json").values() for t in batch])
+                else:
+                    yield "".join(TaskResponse.model_validate(t).model_dump_json() + "\n" for t in batch)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    return StreamingResponse(rows(), media_type=media_type, headers=headers)
+
 
-    total = (await db.execute(select(func.count(Task.id)).where(and_(*conditions)))).scalar()
-    tasks = (await db.execute(select(Task).where(and_(*conditions)).order_by(Task.created_at.desc()).offset((page - 1) * per_page).limit(per_page))).scalars().all()
+def _csv_chunk(rows: Iterable[Iterable[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
 
-    response = {"tasks": [TaskResponse.model_validate(t).model_dump() for t in tasks], "total": total, "page": page, "per_page": per_page, "pages": -(-total // per_page)}
-    await redis_client.set(cache_key, response, ttl=settings.CACHE_TTL_MEDIUM)
-    return response
+
+@router.get("/stream")
+async def stream_task_changes(
+    last_event_id: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_principal),
+):
+    """Server-Sent Events feed of the caller's task changes, replacing list polling.
+
+    Events are named created, updated, archived or deleted and carry the task id. Reconnecting with
+    Last-Event-ID replays what was missed; if that part of the feed was already trimmed, a "reset"
+    event tells the client to reload its list instead.
+    """
+    if last_event_id is not None:
+        try:
+            stream_id_key(last_event_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID") from exc
+    if not stream_slots.try_acquire():
+        raise HTTPException(status_code=503, detail="Too many open streams, retry shortly", headers={"Retry-After": "5"})
+    key = task_stream_key(current_user.id)
+
+    async def events():
+        oldest, newest = await redis_client.stream_bounds(key)
+        yield sse_frame(retry=settings.SSE_RETRY_MS)
+        # Start from a concrete id rather than "$", so nothing added between reads is skipped.
+        cursor = newest or "0-0"
+        if last_event_id is not None:
+            if oldest and stream_id_key(oldest) > stream_id_key(last_event_id):
+                yield sse_frame("{}", event="reset", id=newest)
+            else:
+                cursor = last_event_id
+        while True:
+            entries = await redis_client.read_stream(key, cursor, settings.SSE_HEARTBEAT_SECONDS * 1000)
+            if not entries:
+                yield sse_comment("heartbeat")
+                continue
+            yield "".join(
+                sse_frame(json.dumps({"task_id": int(fields["task_id"]), "at": fields["at"]}), event=fields["event"], id=entry_id)
+                for entry_id, fields in entries
+            )
+            cursor = entries[-1][0]
+
+    return EventStreamResponse(events(), stream_slots)
 
 
 @router.post("/", response_model=TaskResponse, status_code=201)
-async def create_task(task_in: TaskCreate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def create_task(task_in: TaskCreate, current_user: CurrentUser = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     task = Task(**task_in.model_dump(), owner_id=current_user.id, status="pending")
     db.add(task)
     await db.flush()
     await db.refresh(task)
-    await redis_client.delete_pattern(f"tasks:user:{current_user.id}:*")
+    await apply_counter_deltas(db, added=[counter_bucket(task)])
+    await record_task_events(db, current_user.id, [task.id], "created")
+
+    def queue(pipe: CachePipeline):
+        schedule_reminders(pipe, [task], catch_up=True)
+        invalidate_task_caches(pipe, current_user.id)
+
+    pipeline_after_commit(db, queue)
     return task
 
 
+def _check_batch_size(items: List[Any]):
+    if not items:
+        raise HTTPException(status_code=422, detail="At least one item is required")
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+
+
+def _item_errors(exc: ValidationError) -> List[dict]:
+    return exc.errors(include_url=False, include_context=False, include_input=False)
+
+
+def _item_error(type: str, msg: str, loc: list[str] | None = None) -> dict:
+    return {"type": type, "loc": ["id"] if loc is None else loc, "msg": msg}
+
+
+async def _lock_counter_buckets(db: AsyncSession, owner_id: int, task_ids: Iterable[int]) -> Dict[int, tuple]:
+    """Lock the caller's tasks among `task_ids` and return their counter buckets before the write."""
+    stmt = (
+        select(Task.id, *COUNTER_BUCKET_COLUMNS)
+        .where(Task.id.in_(set(task_ids)), Task.owner_id == owner_id)
+        .order_by(Task.id)
+        .with_for_update()
+    )
+    return {task_id: tuple(bucket) for task_id, *bucket in (await db.execute(stmt)).all()}
+
+
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_create_tasks(
+    items: List[Dict[str, Any]] = Body(..., description="`TaskCreate` objects; invalid items are reported, valid ones created"),
+    current_user: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    _check_batch_size(items)
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            rows.append({**TaskCreate.model_validate(item).model_dump(), "owner_id": current_user.id, "status": "pending"})
+        except ValidationError as exc:
+            errors.append(BulkItemError(index=index, errors=_item_errors(exc)))
+
+    tasks = (await db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows)).all() if rows else []
+    if tasks:
+        await apply_counter_deltas(db, added=[counter_bucket(t) for t in tasks])
+        await record_task_events(db, current_user.id, [t.id for t in tasks], "created")
+
+        def queue(pipe: CachePipeline):
+            schedule_reminders(pipe, tasks, catch_up=True)
+            invalidate_task_caches(pipe, current_user.id)
+
+        pipeline_after_commit(db, queue)
+    return TaskBulkResponse(tasks=[TaskResponse.model_validate(t) for t in tasks], errors=errors)
+
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def bulk_update_tasks(
+    items: List[Dict[str, Any]] = Body(..., description="`TaskUpdate` objects with an `id`; identical changes share one UPDATE"),
+    current_user: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    _check_batch_size(items)
+    errors, changes_by_index, seen_ids = [], {}, set()
+    for index, item in enumerate(items):
+        try:
+            update_in = TaskBulkUpdateItem.model_validate(item)
+        except ValidationError as exc:
+            item_id = item.get("id")
+            errors.append(BulkItemError(index=index, id=item_id if isinstance(item_id, int) else None, errors=_item_errors(exc)))
+            continue
+        changes = update_in.model_dump(exclude_unset=True, exclude={"id"})
+        if not changes:
+            errors.append(BulkItemError(index=index, id=update_in.id, errors=[_item_error("no_changes", "No fields to update", [])]))
+        elif update_in.id in seen_ids:
+            errors.append(BulkItemError(index=index, id=update_in.id, errors=[_item_error("duplicate_id", "Duplicate id in batch")]))
+        else:
+            seen_ids.add(update_in.id)
+            changes_by_index[index] = (update_in.id, changes)
+
+    before = {}
+    if seen_ids:
+        before = await _lock_counter_buckets(db, current_user.id, seen_ids)
+    groups: Dict[tuple, List[int]] = {}
+    for index, (task_id, changes) in changes_by_index.items():
+        if task_id not in before:
+            errors.append(BulkItemError(index=index, id=task_id, errors=[_item_error("not_found", "Task not found")]))
+        else:
+            groups.setdefault(tuple(sorted(changes.items())), []).append(task_id)
+
+    tasks, reschedule = [], []
+    for changes, group_ids in groups.items():
+        stmt = update(Task).where(Task.id.in_(group_ids), Task.owner_id == current_user.id).values(dict(changes)).returning(Task)
+        updated = (await db.scalars(stmt, execution_options={"synchronize_session": False})).all()
+        reschedule.append((updated, "due_date" in dict(changes)))
+        tasks.extend(updated)
+    if tasks:
+        await apply_counter_deltas(db, removed=[before[t.id] for t in tasks], added=[counter_bucket(t) for t in tasks])
+        await record_task_events(db, current_user.id, [t.id for t in tasks], "updated")
+
+        def queue(pipe: CachePipeline):
+            for updated, catch_up in reschedule:
+                schedule_reminders(pipe, updated, catch_up=catch_up)
+            invalidate_task_caches(pipe, current_user.id, [t.id for t in tasks])
+
+        pipeline_after_commit(db, queue)
+    return TaskBulkResponse(tasks=[TaskResponse.model_validate(t) for t in tasks], errors=sorted(errors, key=lambda e: e.index))
+
+
+@router.post("/bulk/archive", response_model=TaskBulkResponse)
+async def bulk_archive_tasks(
+    body: TaskBulkArchive,
+    current_user: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    _check_batch_size(body.ids)
+    before = await _lock_counter_buckets(db, current_user.id, body.ids)
+    stmt = update(Task).where(Task.id.in_(body.ids), Task.owner_id == current_user.id).values(is_archived=True).returning(Task)
+    tasks = (await db.scalars(stmt, execution_options={"synchronize_session": False})).all()
+    archived = {t.id for t in tasks}
+    missing = [(index, task_id) for index, task_id in enumerate(body.ids) if task_id not in archived]
+    errors = [BulkItemError(index=index, id=task_id, errors=[_item_error("not_found", "Task not found")]) for index, task_id in missing]
+    if tasks:
+        await apply_counter_deltas(db, removed=[before[t.id] for t in tasks], added=[counter_bucket(t) for t in tasks])
+        await record_task_events(db, current_user.id, archived, "archived")
+
+        def queue(pipe: CachePipeline):
+            unschedule_reminders(pipe, archived)
+            invalidate_task_caches(pipe, current_user.id, archived)
+
+        pipeline_after_commit(db, queue)
+    return TaskBulkResponse(tasks=[TaskResponse.model_validate(t) for t in tasks], errors=errors)
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    cached = await redis_client.get(f"task:{task_id}")
-    if cached:
-        return cached
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.owner_id == current_user.id))
-    task = result.scalar_one_or_none()
-    if not task:
+async def get_task(
+    task_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    async def load() -> Optional[dict]:
+        # Loaded without the owner filter so coalesced callers share one result; ownership is checked below.
+        task = (await db.execute(select(Task).where(Task.id == task_id))).scalar_one_or_none()
+        if not task:
+            return None
+        etag = make_etag("task", task.id, task.updated_at.isoformat())
+        return encode_body(TaskResponse.model_validate(task), etag=etag, owner_id=task.owner_id)
+
+    entry = await redis_client.get_or_load(task_cache_key(task_id), load, ttl=settings.CACHE_TTL_SHORT, stale_ttl=settings.CACHE_STALE_TTL)
+    if not entry or entry["owner_id"] != current_user.id:
         raise HTTPException(status_code=404, detail="Task not found")
-    await redis_client.set(f"task:{task_id}", TaskResponse.model_validate(task).model_dump(), ttl=settings.CACHE_TTL_SHORT)
-    return task
+    if etag_matches(request, entry["etag"]):
+        return not_modified(entry["etag"])
+    return cached_response(entry)
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
-async def update_task(task_id: int, task_update: TaskUpdate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.owner_id == current_user.id))
+async def update_task(task_id: int, task_update: TaskUpdate, current_user: CurrentUser = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.owner_id == current_user.id).with_for_update())
     task = result.scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    for field, value in task_update.model_dump(exclude_unset=True).items():
+    before = counter_bucket(task)
+    changes = task_update.model_dump(exclude_unset=True)
+    for field, value in changes.items():
         setattr(task, field, value)
     await db.flush()
     await db.refresh(task)
-    await redis_client.delete(f"task:{task_id}")
-    await redis_client.delete_pattern(f"tasks:user:{current_user.id}:*")
+    await apply_counter_deltas(db, removed=[before], added=[counter_bucket(task)])
+    await record_task_events(db, current_user.id, [task_id], "updated")
+
+    def queue(pipe: CachePipeline):
+        schedule_reminders(pipe, [task], catch_up="due_date" in changes)
+        invalidate_task_caches(pipe, current_user.id, [task_id])
+
+    pipeline_after_commit(db, queue)
     return task
 
 
 @router.delete("/{task_id}", status_code=204)
-async def delete_task(task_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.owner_id == current_user.id))
+async def delete_task(task_id: int, current_user: CurrentUser = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.owner_id == current_user.id).with_for_update())
     task = result.scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     await db.delete(task)
-    await redis_client.delete(f"task:{task_id}")
-    await redis_client.delete_pattern(f"tasks:user:{current_user.id}:*")
+    await apply_counter_deltas(db, removed=[counter_bucket(task)])
+    await record_task_events(db, current_user.id, [task_id], "deleted")
+
+    def queue(pipe: CachePipeline):
+        unschedule_reminders(pipe, [task_id])
+        invalidate_task_caches(pipe, current_user.id, [task_id])
+
+    pipeline_after_commit(db, queue)
@@ -1,17 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_current_admin
+from app.core.database import get_db, mark_recent_write, pipeline_after_commit
+from app.core.dependencies import USERS_NAMESPACE, get_current_user, get_current_principal, get_current_admin, get_read_db, evict_principal
+from app.core.redis_client import CachePipeline, redis_client
 from app.models.user import User
-from app.schemas.user import UserResponse, UserUpdate, UserAdminUpdate
+from app.schemas.user import CurrentUser, UserResponse, UserUpdate, UserAdminUpdate
+from app.utils.responses import etag_matches, make_etag, not_modified
 
 router = APIRouter()
 
 
+def user_changed(db: AsyncSession, user_id: int, actor_id: int):
+    def queue(pipe: CachePipeline):
+        evict_principal(pipe, user_id)
+        pipe.bump_version(USERS_NAMESPACE)
+        # /me takes its ETag from the primary, so the changed user reads the primary too until replicas catch up.
+        for pinned in {user_id, actor_id}:
+            mark_recent_write(pipe, pinned)
+
+    pipeline_after_commit(db, queue)
+
+
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_me(
+    request: Request,
+    response: Response,
+    principal: CurrentUser = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+):
+    etag = make_etag("user", principal.id, principal.updated_at.isoformat()) if principal.updated_at else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
+    user = (await db.execute(select(User).where(User.id == principal.id))).scalar_one()
+    if etag:
+        response.headers["ETag"] = etag
+    return user
 
 
 @router.patch("/me", response_model=UserResponse)
@@ -20,17 +44,29 @@ async def update_me(update: UserUpdate, current_user: User = Depends(get_current
         setattr(current_user, field, value)
     await db.flush()
     await db.refresh(current_user)
+    user_changed(db, current_user.id, current_user.id)
     return current_user
 
 
 @router.get("/", response_model=list[UserResponse], dependencies=[Depends(get_current_admin)])
-async def list_users(db: AsyncSession = Depends(get_db)):
+async def list_users(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    # Read from the primary: the ETag is the primary's namespace version, and an admin who did not make
+    # the last write is not pinned by read-your-writes, so a lagging replica would serve an old body under it.
+    etag = make_etag(USERS_NAMESPACE, await redis_client.get_version(USERS_NAMESPACE))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     result = await db.execute(select(User).order_by(User.created_at.desc()))
+    response.headers["ETag"] = etag
     return result.scalars().all()
 
 
-@router.patch("/{user_id}", response_model=UserResponse, dependencies=[Depends(get_current_admin)])
-async def update_user(user_id: int, update: UserAdminUpdate, db: AsyncSession = Depends(get_db)):
+@router.patch("/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    update: UserAdminUpdate,
+    admin: CurrentUser = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if not user:
@@ -39,4 +75,5 @@ async def update_user(user_id: int, update: UserAdminUpdate, db: AsyncSession =
         setattr(user, field, value)
     await db.flush()
     await db.refresh(user)
+    user_changed(db, user.id, admin.id)
     return user
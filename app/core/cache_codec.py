@@ -0,0 +1,74 @@
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any
+import msgpack
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is used instead
+    zstandard = None
+
+# Encoded entries start with a format byte: (serializer << 2) | compression. Every value is a
+# control character, so it can never be the first byte of a legacy JSON entry, which is
+# stored without a header and still decoded for entries written by older releases.
+SERIALIZERS = {"json": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2}
+DECODE_ERRORS = (ValueError, zlib.error) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class CacheDecodeError(ValueError):
+    pass
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class CacheCodec:
+    """Serializes cache values, compressing payloads larger than `threshold` bytes.
+
+    serializer="json" writes plain headerless JSON that releases predating the codec can read;
+    use it while rolling out, then switch to msgpack once every worker decodes the new format.
+    """
+
+    def __init__(self, serializer: str = "msgpack", compression: str = "zlib", threshold: int = 1024):
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        self.serializer = SERIALIZERS[serializer]
+        self.compression = COMPRESSIONS[compression]
+        self.threshold = threshold
+        if zstandard is not None:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=3)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, value: Any) -> bytes:
+        if self.serializer == SERIALIZERS["json"]:
+            return json.dumps(value, default=str).encode()
+        payload = msgpack.packb(value, default=_default)
+        compression = COMPRESSIONS["none"]
+        if self.compression and len(payload) > self.threshold:
+            compression = self.compression
+            payload = self._zstd_compressor.compress(payload) if compression == COMPRESSIONS["zstd"] else zlib.compress(payload, 1)
+        return bytes([self.serializer << 2 | compression]) + payload
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            if data[0] >= 0x20:
+                return json.loads(data)
+            serializer, compression, payload = data[0] >> 2, data[0] & 0b11, data[1:]
+            if compression == COMPRESSIONS["zlib"]:
+                payload = zlib.decompress(payload)
+            elif compression == COMPRESSIONS["zstd"]:
+                if zstandard is None:
+                    raise CacheDecodeError("zstandard is not installed")
+                payload = self._zstd_decompressor.decompress(payload)
+            if serializer == SERIALIZERS["msgpack"]:
+                return msgpack.unpackb(payload)
+            if serializer == SERIALIZERS["json"]:
+                return json.loads(payload)
+        except DECODE_ERRORS as exc:
+            raise CacheDecodeError(str(exc)) from exc
+        raise CacheDecodeError(f"Unknown cache format byte {data[0]:#04x}")
@@ -13,11 +13,28 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
 
     DATABASE_URL: str
     DATABASE_URL_SYNC: str
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_RETRY_SECONDS: int = 10
+    READ_YOUR_WRITES_SECONDS: int = 5
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_ECHO: bool = False
+    DB_SLOW_QUERY_MS: int = 200
 
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 2.0
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    REDIS_CONNECT_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
 
@@ -27,6 +44,52 @@ class Settings(BaseSettings):
     CACHE_TTL_MEDIUM: int = 300
     CACHE_TTL_LONG: int = 3600
 
+    BULK_MAX_ITEMS: int = 1000
+    EXPORT_BATCH_SIZE: int = 500
+
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_CHUNK_SIZE: int = 5000
+    ARCHIVE_THROTTLE_SECONDS: float = 0.2
+
+    REPORT_SHARDS: int = 16
+    REPORT_BATCH_SIZE: int = 500
+
+    REMINDER_LEAD_MINUTES: int = 60
+    REMINDER_BATCH_SIZE: int = 500
+    REMINDER_CHUNK_SIZE: int = 50
+
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_INTERVAL: float = 2.0
+    WORKER_METRICS_PORT: int = 0
+
+    CACHE_CODEC: str = "msgpack"
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESS_THRESHOLD: int = 1024
+
+    CACHE_STALE_TTL: int = 0
+    CACHE_STAMPEDE_LOCK: bool = False
+    CACHE_LOCK_TIMEOUT_MS: int = 2000
+
+    PRINCIPAL_CACHE_TTL: int = 30
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_AUTH: str = "20/minute"
+    RATE_LIMIT_TASKS: str = "600/minute"
+    RATE_LIMIT_DEFAULT: str = "300/minute"
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10_000
+    # Addresses or CIDRs of reverse proxies whose X-Forwarded-For / X-Real-IP headers are believed.
+    TRUSTED_PROXIES: list[str] = []
+
+    TASK_STREAM_MAXLEN: int = 1000
+    TASK_STREAM_TTL: int = 86400
+    SSE_MAX_STREAMS: int = 200
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_RETRY_MS: int = 3000
+
+    CACHE_L1_ENABLED: bool = False
+    CACHE_L1_MAX_ENTRIES: int = 10_000
+    CACHE_L1_TTL: int = 5
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,14 +1,41 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from app.core.config import settings
+from app.core.metrics import InstrumentedPool, instrument_engine
+from app.core.redis_client import CachePipeline, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def create_pooled_engine(url: str, name: str) -> AsyncEngine:
+    """Async engine sized by the DB_POOL_* settings, with pool and query metrics labelled `name`.
+
+    Each worker process gets its own pool, so Postgres sees up to
+    workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections per engine; db_pool_max_connections
+    on /metrics reports that sum.
+    """
+    async_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    instrument_engine(async_engine.sync_engine, name)
+    return async_engine
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+
+engine = create_pooled_engine(settings.DATABASE_URL, "primary")
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -16,6 +43,52 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+replica_engines = [create_pooled_engine(url, f"replica{i}") for i, url in enumerate(settings.DATABASE_REPLICA_URLS)]
+
+
+class ReplicaRouter:
+    """Round-robin over read replicas, skipping any that failed to connect in the last REPLICA_RETRY_SECONDS.
+
+    Sessions are handed out unconnected, so picking a replica costs nothing; health is learned from
+    the requests that use them, through use().
+    """
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self._sessionmakers = [async_sessionmaker(e, class_=AsyncSession, expire_on_commit=False) for e in engines]
+        self._down_until = [0.0] * len(engines)
+        self._next = 0
+
+    def session(self) -> Optional[AsyncSession]:
+        """A session on the next healthy replica, or None when every replica is down."""
+        for _ in range(len(self._sessionmakers)):
+            index, self._next = self._next, (self._next + 1) % len(self._sessionmakers)
+            if self._down_until[index] <= time.monotonic():
+                return self._sessionmakers[index](info={"replica": index})
+        return None
+
+    @asynccontextmanager
+    async def use(self, session: AsyncSession) -> AsyncIterator[AsyncSession]:
+        """Open `session`, marking its replica down if the server cannot be reached while it is in use."""
+        async with session:
+            try:
+                yield session
+            except (DBAPIError, OSError) as exc:
+                index = session.info.get("replica")
+                if index is not None and (isinstance(exc, OSError) or exc.connection_invalidated):
+                    self._down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+                raise
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {"replicas": len(self._down_until), "healthy": sum(down_until <= now for down_until in self._down_until)}
+
+
+replica_router = ReplicaRouter(replica_engines)
+
+# Celery workers are synchronous; they share the models but talk to Postgres through psycopg2.
+sync_engine = create_engine(settings.DATABASE_URL_SYNC, pool_pre_ping=True)
+SyncSessionLocal = sessionmaker(sync_engine, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
@@ -31,3 +104,55 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+        await run_after_commit(session)
+
+
+async def run_after_commit(session: AsyncSession):
+    for callback in session.info.pop("after_commit", []):
+        try:
+            await callback()
+        except Exception:
+            # The write is already committed; a failed side effect must not turn it into an error.
+            logger.exception("after_commit callback failed")
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]):
+    """Run `callback` once get_db has committed `session`; dropped if the request rolls back."""
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+def pipeline_after_commit(session: AsyncSession, queue: Callable[[CachePipeline], None]):
+    """Send the cache writes `queue` adds to a pipeline once `session` commits.
+
+    Invalidating earlier lets a concurrent reader refill the cache from the pre-commit rows.
+    """
+
+    async def send():
+        async with redis_client.pipeline() as pipe:
+            queue(pipe)
+
+    after_commit(session, send)
+
+
+def recent_write_key(user_id: int) -> str:
+    return f"ryw:user:{user_id}"
+
+
+def mark_recent_write(pipe: CachePipeline, user_id: int):
+    """Pin the user's reads to the primary for READ_YOUR_WRITES_SECONDS so replica lag cannot hide their write."""
+    if replica_engines:
+        pipe.set(recent_write_key(user_id), 1, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+async def read_session(user_id: int) -> AsyncSession:
+    """Unconnected read-only session on a replica, or on the primary within the user's read-your-writes window."""
+    if replica_engines:
+        try:
+            pinned = await redis_client.get(recent_write_key(user_id))
+        except Exception:
+            pinned = True
+        if not pinned:
+            session = replica_router.session()
+            if session is not None:
+                return session
+    return AsyncSessionLocal()
@@ -2,35 +2,84 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, read_session, replica_router
+from app.core.redis_client import CachePipeline, redis_client
 from app.core.security import decode_token
 from app.models.user import User
+from app.schemas.user import CurrentUser
 
 security = HTTPBearer()
 
+USERS_NAMESPACE = "users"
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+
+def principal_cache_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+def evict_principal(pipe: CachePipeline, user_id: int):
+    pipe.delete(principal_cache_key(user_id))
+
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
     payload = decode_token(credentials.credentials)
     if not payload or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token", headers={"WWW-Authenticate": "Bearer"})
+    return int(payload["sub"])
 
-    result = await db.execute(select(User).where(User.id == int(payload["sub"])))
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> CurrentUser:
+    user_id = _token_user_id(credentials)
+    try:
+        cached = await redis_client.get(principal_cache_key(user_id))
+    except Exception:
+        # Authentication must not depend on the cache; without Redis every request reads the user row.
+        cached = None
+    if cached:
+        principal = CurrentUser.model_validate(cached)
+    else:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found or inactive")
+        principal = CurrentUser.model_validate(user)
+        try:
+            await redis_client.set(principal_cache_key(user_id), principal.model_dump(), ttl=settings.PRINCIPAL_CACHE_TTL)
+        except Exception:
+            pass
+    if not principal.is_active:
+        raise HTTPException(status_code=404, detail="User not found or inactive")
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    result = await db.execute(select(User).where(User.id == _token_user_id(credentials)))
     user = result.scalar_one_or_none()
     if not user or not user.is_active:
         raise HTTPException(status_code=404, detail="User not found or inactive")
     return user
 
 
-async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_read_db(current_user: CurrentUser = Depends(get_current_principal)) -> AsyncSession:
+    """Session for read-only endpoints; served by a replica when DATABASE_REPLICA_URLS is set."""
+    async with replica_router.use(await read_session(current_user.id)) as session:
+        yield session
+
+
+async def get_current_admin(current_user: CurrentUser = Depends(get_current_principal)) -> CurrentUser:
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
 
-async def get_current_manager_or_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_manager_or_admin(current_user: CurrentUser = Depends(get_current_principal)) -> CurrentUser:
     if current_user.role not in ("admin", "manager"):
         raise HTTPException(status_code=403, detail="Manager or admin access required")
     return current_user
@@ -0,0 +1,186 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger("app.db")
+
+# Gauges are per process; "livesum" adds the live workers up once metrics are aggregated across processes.
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured persistent connections", ["pool"], multiprocess_mode="livesum")
+DB_POOL_MAX = Gauge("db_pool_max_connections", "Configured pool_size + max_overflow", ["pool"], multiprocess_mode="livesum")
+DB_POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections checked out of the pool", ["pool"], multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow_connections", "Open connections beyond pool_size", ["pool"], multiprocess_mode="livesum")
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to obtain a usable connection, including queueing for a free slot",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout", ["pool"])
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Statement execution time",
+    ["pool"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS", ["pool"])
+
+HTTP_REQUESTS = Counter("http_requests_total", "Requests handled", ["method", "route", "status"])
+HTTP_DURATION_SECONDS = Histogram("http_request_duration_seconds", "Time to send the full response", ["method", "route"])
+HTTP_IN_PROGRESS = Gauge("http_requests_in_progress", "Requests being handled", ["method"], multiprocess_mode="livesum")
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Statements executed while handling a request", ["route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache reads by key family", ["family", "result"])
+
+OUTBOX_EVENTS_RELAYED = Counter("outbox_events_relayed_total", "Task events published from the outbox")
+OUTBOX_MESSAGES_PUBLISHED = Counter("outbox_messages_published_total", "Grouped notification messages sent to the broker")
+OUTBOX_DELIVERY_LAG_SECONDS = Histogram(
+    "outbox_delivery_lag_seconds",
+    "Time from an event's commit to its publication",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+
+CACHE_KEY_FAMILIES = ("tasks:user:", "task:", "principal:", "ns:", "ryw:user:")
+
+# Mutable holder set per request so statements run from SQLAlchemy's greenlets can count into it.
+_request_queries: ContextVar[Optional[list[int]]] = ContextVar("request_queries", default=None)
+
+
+def cache_key_family(key: str) -> str:
+    for prefix in CACHE_KEY_FAMILIES:
+        if key.startswith(prefix):
+            return prefix
+    return "other"
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited; name it with `pool_logging_name`."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self._pool_name()).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self._pool_name()).observe(time.perf_counter() - start)
+
+    def _pool_name(self) -> str:
+        return getattr(self, "logging_name", None) or "default"
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Publish pool occupancy and statement timings for `engine` (the `.sync_engine` of an async engine)."""
+    DB_POOL_SIZE.labels(name).set(engine.pool.size())
+    DB_POOL_MAX.labels(name).set(engine.pool.size() + max(engine.pool._max_overflow, 0))
+
+    # Registered on the engine rather than the pool so the listeners survive engine.dispose().
+    # Overflow connections are closed on checkin, so the overflow in use is whatever exceeds pool_size.
+    def record_occupancy(in_use: int):
+        DB_POOL_IN_USE.labels(name).set(in_use)
+        DB_POOL_OVERFLOW.labels(name).set(max(in_use - engine.pool.size(), 0))
+
+    event.listen(engine, "checkout", lambda *_: record_occupancy(engine.pool.checkedout()))
+    # checkin fires before the connection is back in the pool.
+    event.listen(engine, "checkin", lambda *_: record_occupancy(engine.pool.checkedout() - 1))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("query_start")
+        DB_QUERY_SECONDS.labels(name).observe(elapsed)
+        queries = _request_queries.get()
+        if queries is not None:
+            queries[0] += 1
+        if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+            DB_SLOW_QUERIES.labels(name).inc()
+            logger.warning("Slow query on %s pool (%.0f ms): %s", name, elapsed * 1000, statement[:500])
+
+
+class PrometheusMiddleware:
+    """Per-route request counts, latency and DB query counts; routes are labelled by path template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, status = scope["method"], 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        queries = [0]
+        token = _request_queries.set(queries)
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            _request_queries.reset(token)
+            # The router stores the matched route in the scope; requests it never matched share one label.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_DURATION_SECONDS.labels(method, route).observe(elapsed)
+            HTTP_DB_QUERIES.labels(route).observe(queries[0])
+
+
+def multiprocess_enabled() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition; with PROMETHEUS_MULTIPROC_DIR set, merges every worker's metrics."""
+    return Response(generate_latest(multiprocess_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+def multiprocess_registry() -> CollectorRegistry:
+    registry = REGISTRY
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def start_metrics_server(port: int):
+    """Serve metrics over HTTP from a process without an API, e.g. the Celery worker's parent."""
+    start_http_server(port, registry=multiprocess_registry())
+
+
+def mark_worker_exited():
+    """Drop this worker's live gauges from the multiprocess aggregate."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,181 @@
+import ipaddress
+import math
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.core.security import decode_token
+from app.utils.local_cache import LocalCache
+
+# Token bucket refilled at capacity/period. Uses the Redis clock so replicas with skewed clocks
+# share one bucket consistently. Returns {allowed, remaining tokens, ms until the next token}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_ms = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * per_ms)
+local allowed, retry_after = 0, 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / per_ms)
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / per_ms))
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+REDIS_RETRY_SECONDS = 1.0
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """"100/minute" -> (100, 60): bucket capacity and the seconds it takes to refill."""
+    capacity, _, period = rate.partition("/")
+    return int(capacity), PERIODS[period.strip()]
+
+
+class LocalTokenBuckets:
+    """Per-process token buckets with the same semantics as TOKEN_BUCKET_SCRIPT."""
+
+    def __init__(self, max_entries: int):
+        self._buckets = LocalCache(max_entries, ttl=max(PERIODS.values()))
+
+    def take(self, key: str, capacity: int, period: int) -> Tuple[int, int, int]:
+        per_ms = capacity / (period * 1000)
+        now = time.monotonic() * 1000
+        bucket = self._buckets.get(key)
+        tokens = capacity if bucket is None else min(capacity, bucket[0] + max(0.0, now - bucket[1]) * per_ms)
+        allowed, retry_after = 0, 0
+        if tokens >= 1:
+            tokens -= 1
+            allowed = 1
+        else:
+            retry_after = math.ceil((1 - tokens) / per_ms)
+        self._buckets.set(key, (tokens, now), ttl=period)
+        return allowed, math.floor(tokens), retry_after
+
+
+class RateLimiter:
+    """Shared limits through Redis; while Redis is unreachable, each process enforces them on its own."""
+
+    def __init__(self):
+        self._local = LocalTokenBuckets(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+        self._redis_retry_at = 0.0
+        self._stats = {"allowed": 0, "limited": 0, "local_fallbacks": 0}
+
+    async def hit(self, key: str, rate: str) -> Tuple[int, int, int]:
+        capacity, period = parse_rate(rate)
+        result = None
+        if time.monotonic() >= self._redis_retry_at:
+            try:
+                result = await redis_client.run_script(TOKEN_BUCKET_SCRIPT, [key], [capacity, capacity / (period * 1000)])
+            except Exception:
+                # Skip Redis for a moment instead of paying a failed round trip on every request.
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+        if result is None:
+            self._stats["local_fallbacks"] += 1
+            result = self._local.take(key, capacity, period)
+        allowed, remaining, retry_after = (int(value) for value in result)
+        self._stats["allowed" if allowed else "limited"] += 1
+        return allowed, remaining, retry_after
+
+    def stats(self) -> dict:
+        return {**self._stats, "backend": "redis" if time.monotonic() >= self._redis_retry_at else "local"}
+
+
+rate_limiter = RateLimiter()
+
+
+def route_group(path: str) -> Optional[str]:
+    """Limit group for an API path; health checks and docs outside the API prefix are not limited."""
+    if not path.startswith(settings.API_V1_STR):
+        return None
+    path = path[len(settings.API_V1_STR):]
+    if path.startswith("/auth"):
+        return "auth"
+    if path.startswith("/tasks"):
+        return "tasks"
+    return "default"
+
+
+@lru_cache(maxsize=8)
+def trusted_networks(proxies: tuple[str, ...]) -> tuple:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_networks(tuple(settings.TRUSTED_PROXIES)))
+
+
+def client_ip(scope: Scope, headers: Headers) -> str:
+    """The peer address, or the address a trusted proxy forwarded for it.
+
+    X-Forwarded-For is read right to left, skipping proxies we trust, so a client cannot choose its
+    bucket by sending its own header: only hops appended by trusted proxies are believed.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not is_trusted_proxy(address):
+        return address
+    hops = [hop.strip() for hop in headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else headers.get("x-real-ip", address).strip()
+
+
+def client_identity(scope: Scope, group: str) -> str:
+    """Authenticated callers are limited per user, everyone else (and all auth routes) per client IP."""
+    headers = Headers(scope=scope)
+    if group != "auth":
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        payload = decode_token(token) if scheme.lower() == "bearer" and token else None
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{client_ip(scope, headers)}"
+
+
+class RateLimitMiddleware:
+    """Applies RATE_LIMIT_AUTH / RATE_LIMIT_TASKS / RATE_LIMIT_DEFAULT with one Redis script call per request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        group = route_group(scope["path"]) if scope["type"] == "http" and settings.RATE_LIMIT_ENABLED else None
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        rate = {"auth": settings.RATE_LIMIT_AUTH, "tasks": settings.RATE_LIMIT_TASKS}.get(group, settings.RATE_LIMIT_DEFAULT)
+        allowed, remaining, retry_after = await rate_limiter.hit(f"ratelimit:{group}:{client_identity(scope, group)}", rate)
+        limit_headers = {"X-RateLimit-Limit": str(parse_rate(rate)[0]), "X-RateLimit-Remaining": str(remaining)}
+        if not allowed:
+            headers = {**limit_headers, "Retry-After": str(max(1, math.ceil(retry_after / 1000)))}
+            response = JSONResponse(status_code=429, content={"detail": "Too many requests"}, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in limit_headers.items():
+                    headers.append(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
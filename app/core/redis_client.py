@@ -1,53 +1,358 @@
+import asyncio
 import json
-from typing import Any, Optional
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+import redis
 import redis.asyncio as aioredis
+from app.core.cache_codec import CacheCodec, CacheDecodeError
 from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS, cache_key_family
+from app.utils.local_cache import LocalCache
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def version_key(namespace: str) -> str:
+    return f"ns:{namespace}"
+
+
+class CachePipeline:
+    """Cache writes queued on a Redis pipeline; RedisClient.pipeline sends them in one round trip."""
+
+    def __init__(self, pipe: aioredis.client.Pipeline, codec: CacheCodec):
+        self._pipe = pipe
+        self._codec = codec
+        self.invalidated: list[str] = []
+        self.local_values: dict[str, tuple[Any, int]] = {}
+
+    def set(self, key: str, value: Any, ttl: int = 300):
+        self._pipe.setex(key, ttl, self._codec.encode(value))
+        self.invalidated.append(key)
+        self.local_values[key] = (value, ttl)
+
+    def delete(self, *keys: str):
+        if keys:
+            self._pipe.delete(*keys)
+            self.invalidated.extend(keys)
+            for key in keys:
+                self.local_values.pop(key, None)
+
+    def bump_version(self, namespace: str):
+        self._pipe.incr(version_key(namespace))
+        self.invalidated.append(version_key(namespace))
+
+    def zadd(self, key: str, mapping: dict[str, float]):
+        if mapping:
+            self._pipe.zadd(key, mapping)
+
+    def zrem(self, key: str, *members: str):
+        if members:
+            self._pipe.zrem(key, *members)
 
 
 class RedisClient:
     def __init__(self):
         self._client: Optional[aioredis.Redis] = None
+        self._blocking: Optional[aioredis.Redis] = None
+        self._local: Optional[LocalCache] = None
+        if settings.CACHE_L1_ENABLED:
+            self._local = LocalCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL)
+        self._listener: Optional[asyncio.Task] = None
+        self._instance_id = uuid.uuid4().hex
+        self._codec = CacheCodec(settings.CACHE_CODEC, settings.CACHE_COMPRESSION, settings.CACHE_COMPRESS_THRESHOLD)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._scripts: dict[str, Any] = {}
+        self._stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
 
     async def connect(self):
-        self._client = aioredis.from_url(
+        """Build the connection pools; call once at startup (the app's lifespan) before any other method."""
+        # Callers wait up to REDIS_POOL_TIMEOUT for a free connection instead of opening unbounded ones.
+        pool = aioredis.BlockingConnectionPool.from_url(
             settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
         )
+        self._client = aioredis.Redis(connection_pool=pool)
+        # Blocking reads (XREAD BLOCK, pub/sub) sit idle for long stretches, so they get their own pool without a
+        # read timeout; keepalive detects dead peers instead. One slot per stream plus the invalidation listener.
+        self._blocking = aioredis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.SSE_MAX_STREAMS + 1,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_keepalive=True,
+        )
+        self._scripts.clear()
+        if self._local is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen_invalidations())
+
+    async def _listen_invalidations(self):
+        """Evict L1 entries written or deleted by other workers; drop everything if messages may have been missed."""
+        while True:
+            pubsub = self._blocking.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload["src"] != self._instance_id:
+                        self._local.evict(payload["keys"])
+            except asyncio.CancelledError:
+                await pubsub.aclose()
+                raise
+            except Exception:
+                self._local.clear()
+                await pubsub.aclose()
+                await asyncio.sleep(1)
+
+    async def _invalidate_local(self, keys: Iterable[str]):
+        if self._local is None:
+            return
+        keys = list(keys)
+        self._local.evict(keys)
+        await self._client.publish(INVALIDATION_CHANNEL, json.dumps({"src": self._instance_id, "keys": keys}))
+
+    def cache_stats(self) -> dict:
+        return {**self._stats, "l1_size": len(self._local) if self._local is not None else 0}
 
     async def ping(self) -> bool:
         try:
-            if not self._client:
-                await self.connect()
             return await self._client.ping()
         except Exception:
             return False
 
     async def get(self, key: str) -> Optional[Any]:
-        if not self._client:
-            await self.connect()
-        data = await self._client.get(key)
-        return json.loads(data) if data else None
+        value = self._get_local(key)
+        if value is not None:
+            return value
+        return self._store_remote(key, await self._client.get(key))
+
+    async def mget(self, keys: list[str]) -> list[Optional[Any]]:
+        """Values for `keys` in order (None where missing), fetching everything L1 lacks with one MGET."""
+        values = [self._get_local(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            for i, data in zip(missing, await self._client.mget([keys[i] for i in missing]), strict=True):
+                values[i] = self._store_remote(keys[i], data)
+        return values
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        if self._local is None:
+            return None
+        value = self._local.get(key)
+        if value is None:
+            self._stats["l1_misses"] += 1
+            return None
+        self._stats["l1_hits"] += 1
+        CACHE_REQUESTS.labels(cache_key_family(key), "hit").inc()
+        return value
+
+    def _store_remote(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        """Decode a value read from Redis, count the lookup and keep it in L1."""
+        try:
+            value = self._codec.decode(data) if data else None
+        except CacheDecodeError:
+            value = None
+        if value is None:
+            self._stats["l2_misses"] += 1
+            CACHE_REQUESTS.labels(cache_key_family(key), "miss").inc()
+            return None
+        self._stats["l2_hits"] += 1
+        CACHE_REQUESTS.labels(cache_key_family(key), "hit").inc()
+        if self._local is not None:
+            self._local.set(key, value)
+        return value
 
     async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        if not self._client:
-            await self.connect()
-        return await self._client.setex(key, ttl, json.dumps(value, default=str))
+        result = await self._client.setex(key, ttl, self._codec.encode(value))
+        await self._invalidate_local([key])
+        if self._local is not None:
+            self._local.set(key, value, ttl)
+        return result
+
+    async def mset_with_ttl(self, values: dict[str, Any], ttl: int = 300):
+        """SETEX every entry of `values` in one round trip; MSET itself cannot set expiries."""
+        async with self.pipeline() as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ttl)
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[CachePipeline]:
+        """Queue cache writes and send them, plus one L1 invalidation message, in a single round trip.
+
+        Nothing is sent if the block raises. Use it to batch the cache side effects of one request.
+        """
+        async with self._client.pipeline(transaction=False) as pipe:
+            batch = CachePipeline(pipe, self._codec)
+            yield batch
+            if self._local is not None and batch.invalidated:
+                pipe.publish(INVALIDATION_CHANNEL, json.dumps({"src": self._instance_id, "keys": batch.invalidated}))
+            if len(pipe):
+                await pipe.execute()
+        if self._local is not None:
+            self._local.evict(batch.invalidated)
+            for key, (value, ttl) in batch.local_values.items():
+                self._local.set(key, value, ttl)
 
     async def delete(self, *keys: str) -> int:
-        if not self._client:
-            await self.connect()
-        return await self._client.delete(*keys)
+        deleted = await self._client.delete(*keys)
+        await self._invalidate_local(keys)
+        return deleted
+
+    async def append_stream(self, key: str, entries: list[dict], maxlen: int, ttl: int) -> list[str]:
+        """XADD `entries` in one round trip, trimming to about `maxlen` and expiring idle streams."""
+        async with self._client.pipeline(transaction=False) as pipe:
+            for fields in entries:
+                pipe.xadd(key, fields, maxlen=maxlen, approximate=True)
+            pipe.expire(key, ttl)
+            results = await pipe.execute()
+        return [entry_id.decode() for entry_id in results[:-1]]
+
+    async def stream_bounds(self, key: str) -> tuple[Optional[str], Optional[str]]:
+        """Ids of the oldest and newest entries still in a stream, (None, None) if it is empty."""
+        async with self._client.pipeline(transaction=False) as pipe:
+            oldest, newest = await pipe.xrange(key, count=1).xrevrange(key, count=1).execute()
+        if not oldest or not newest:
+            return None, None
+        return oldest[0][0].decode(), newest[0][0].decode()
+
+    async def read_stream(self, key: str, last_id: str, block_ms: int, count: int = 100) -> list[tuple[str, dict]]:
+        """Entries after `last_id`, waiting up to `block_ms` for one to arrive; [] on timeout."""
+        response = await self._blocking.xread({key: last_id}, count=count, block=block_ms)
+        if not response:
+            return []
+        return [
+            (entry_id.decode(), {field.decode(): value.decode() for field, value in fields.items()})
+            for entry_id, fields in response[0][1]
+        ]
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int = 0) -> Any:
+        """Read-through cache with single-flight loading.
+
+        Concurrent misses for a key in this process share one loader call, and with
+        CACHE_STAMPEDE_LOCK the workers also elect a single loader through a Redis lock.
+        With stale_ttl, an expired entry is still served for that long while one caller
+        refreshes it. The loader returns None for "not found", which is not cached.
+        """
+        entry = await self.get(key)
+        if isinstance(entry, dict) and "fresh_until" in entry:
+            if entry["fresh_until"] > time.time() or key in self._inflight:
+                return entry["value"]
+            lock = await self._acquire_lock(key)
+            if lock is None:
+                return entry["value"]
+            return await self._load(key, loader, ttl, stale_ttl, lock)
+
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+        lock = await self._acquire_lock(key)
+        if lock is None:
+            deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT_MS / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.025)
+                if key in self._inflight:
+                    return await asyncio.shield(self._inflight[key])
+                entry = await self.get(key)
+                if isinstance(entry, dict) and "fresh_until" in entry:
+                    return entry["value"]
+        return await self._load(key, loader, ttl, stale_ttl, lock)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int, lock: Optional[str]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            if value is not None:
+                await self.set(key, {"value": value, "fresh_until": time.time() + ttl}, ttl=ttl + stale_ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if lock:
+                await self._client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", lock)
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """Token for the cross-worker refresh lock, "" when locking is disabled, or None if another worker holds it."""
+        if not settings.CACHE_STAMPEDE_LOCK:
+            return ""
+        token = uuid.uuid4().hex
+        acquired = await self._client.set(f"lock:{key}", token, nx=True, px=settings.CACHE_LOCK_TIMEOUT_MS)
+        return token if acquired else None
+
+    async def run_script(self, source: str, keys: list, args: list) -> Any:
+        """Run a Lua script by SHA, loading it on first use and again after a SCRIPT FLUSH or failover."""
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self._client.register_script(source)
+        return await script(keys=keys, args=args)
+
+    async def get_version(self, namespace: str) -> int:
+        """Current generation of a cache namespace; embed it in keys so a bump orphans them."""
+        key = version_key(namespace)
+        if self._local is not None:
+            version = self._local.get(key)
+            if version is not None:
+                return version
+        version = int(await self._client.get(key) or 0)
+        if self._local is not None:
+            self._local.set(key, version)
+        return version
+
+    async def bump_version(self, namespace: str) -> int:
+        """Invalidate every key built from the namespace with one INCR; orphans expire via TTL."""
+        version = await self._client.incr(version_key(namespace))
+        await self._invalidate_local([version_key(namespace)])
+        return version
 
     async def delete_pattern(self, pattern: str) -> int:
-        if not self._client:
-            await self.connect()
-        keys = await self._client.keys(pattern)
-        return await self._client.delete(*keys) if keys else 0
+        keys = [key.decode() for key in await self._client.keys(pattern)]
+        if not keys:
+            return 0
+        deleted = await self._client.delete(*keys)
+        await self._invalidate_local(keys)
+        return deleted
 
     async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._local is not None:
+            # Invalidations published from now on are not received, so nothing cached locally can be trusted.
+            self._local.clear()
         if self._client:
-            await self._client.aclose()
+            # The pool was passed in, so the client does not own it unless told to.
+            await self._client.aclose(close_connection_pool=True)
+        if self._blocking:
+            await self._blocking.aclose()
 
 
 redis_client = RedisClient()
+
+
+def sync_redis() -> redis.Redis:
+    """Blocking client for Celery workers, which share the cache keyspace with the API."""
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    )
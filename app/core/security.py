@@ -1,11 +1,19 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.utils.local_cache import LocalCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified token -> claims. A token is immutable and its claims are fixed until `exp`, so
+# entries never need invalidation; they are only capped at the access-token lifetime.
+token_cache = LocalCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -15,6 +23,56 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashBusy(Exception):
+    """Raised when the hashing pool's queue is full; callers should shed load rather than queue."""
+
+
+class PasswordHashPool:
+    """Runs bcrypt in worker threads (it releases the GIL) so it never blocks the event loop.
+
+    At most `workers` hashes run at once; beyond `max_pending` waiting calls new work is rejected.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.in_flight >= self.workers + self.max_pending:
+            self.rejected += 1
+            raise PasswordHashBusy()
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": min(self.in_flight, self.workers),
+            "queued": max(self.in_flight - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hash_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run(hash_password, password)
+
+
 def create_access_token(subject: Union[str, int], role: str = "user", expires_delta: Optional[timedelta] = None) -> str:
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     payload = {"sub": str(subject), "role": role, "exp": expire, "type": "access"}
@@ -28,7 +86,14 @@ def create_refresh_token(subject: Union[str, int]) -> str:
 
 
 def decode_token(token: str) -> Optional[dict]:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
     try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
+    remaining = claims.get("exp", 0) - time.time()
+    if remaining > 0 and settings.TOKEN_CACHE_MAX_ENTRIES:
+        token_cache.set(token, claims, remaining)
+    return claims
@@ -1,19 +1,29 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
+from app.core.database import replica_router
+from app.core.metrics import PrometheusMiddleware, mark_worker_exited, metrics_response
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
 from app.core.redis_client import redis_client
+from app.core.security import PasswordHashBusy, password_hash_pool
 from app.api.v1.router import api_router
+from app.api.v1.endpoints.tasks import stream_slots
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Starting Scalable API Platform...")
-    await redis_client.ping()
-    print("✅ Redis connected")
+    await redis_client.connect()
+    if await redis_client.ping():
+        print("✅ Redis connected")
+    else:
+        print("⚠️  Redis unreachable; cache and rate limits degrade until it is back")
     yield
     await redis_client.close()
+    mark_worker_exited()
     print("👋 Shutting down...")
 
 
@@ -25,11 +35,19 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(CORSMiddleware, allow_origins=settings.ALLOWED_ORIGINS, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Outermost, so its latency covers every other middleware and it sees rate-limited and failed requests too.
+app.add_middleware(PrometheusMiddleware)
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.exception_handler(PasswordHashBusy)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashBusy):
+    return JSONResponse(status_code=503, content={"detail": "Authentication is busy, retry shortly"}, headers={"Retry-After": "1"})
+
+
 @app.get("/", tags=["Health"])
 async def root():
     return {"service": settings.PROJECT_NAME, "version": settings.VERSION, "status": "healthy", "docs": "/docs"}
@@ -38,4 +56,18 @@ async def root():
 @app.get("/health", tags=["Health"])
 async def health_check():
     redis_ok = await redis_client.ping()
-    return {"status": "healthy", "redis": "connected" if redis_ok else "disconnected", "database": "connected"}
+    return {
+        "status": "healthy",
+        "redis": "connected" if redis_ok else "disconnected",
+        "database": "connected",
+        "cache": redis_client.cache_stats(),
+        "password_hashing": password_hash_pool.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "database_replicas": replica_router.stats(),
+        "task_streams": stream_slots.stats(),
+    }
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    return metrics_response()
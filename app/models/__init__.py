@@ -1,2 +1,4 @@
 from app.models.user import User
 from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.models.task_event import TaskEvent
@@ -1,12 +1,27 @@
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import String, Boolean, Computed, DateTime, ForeignKey, Index, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
 
+# Title matches outrank description matches; keep in sync with migration 20261018_003.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+OPEN_WITH_DUE_DATE = "due_date IS NOT NULL AND status <> 'completed' AND NOT is_archived"
+
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Only open tasks with a due date; used to rebuild the reminder schedule.
+        Index("ix_tasks_due_date_open", "due_date", postgresql_where=text(OPEN_WITH_DUE_DATE)),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -19,6 +34,7 @@ class Task(Base):
     assigned_to_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True)
 
     owner: Mapped["User"] = relationship("User", foreign_keys=[owner_id], back_populates="tasks")
     assignee: Mapped[Optional["User"]] = relationship("User", foreign_keys=[assigned_to_id])
@@ -19,4 +19,4 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
-    tasks: Mapped[list["Task"]] = relationship("Task", back_populates="owner", lazy="select")
+    tasks: Mapped[list["Task"]] = relationship("Task", back_populates="owner", foreign_keys="Task.owner_id", lazy="select")
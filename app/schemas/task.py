@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Dict, Optional, List
+from pydantic import BaseModel, field_validator
 
 
 class TaskBase(BaseModel):
@@ -23,6 +23,13 @@ class TaskUpdate(BaseModel):
     assigned_to_id: Optional[int] = None
     is_archived: Optional[bool] = None
 
+    @field_validator("status", "priority", "is_archived")
+    def reject_null(cls, v):
+        # Omit a field to leave it unchanged; an explicit null would leave the task uncountable.
+        if v is None:
+            raise ValueError("Field cannot be null")
+        return v
+
 
 class TaskResponse(TaskBase):
     id: int
@@ -39,7 +46,42 @@ class TaskResponse(TaskBase):
 
 class TaskListResponse(BaseModel):
     tasks: List[TaskResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    archived: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBulkArchive(BaseModel):
+    ids: List[int]
+
+
+class BulkErrorDetail(BaseModel):
+    """One problem with a bulk item, in pydantic's error shape whether it failed validation or the write."""
+
+    type: str
+    loc: list[str | int]
+    msg: str
+
+
+class BulkItemError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    errors: List[BulkErrorDetail]
+
+
+class TaskBulkResponse(BaseModel):
+    tasks: List[TaskResponse]
+    errors: List[BulkItemError]
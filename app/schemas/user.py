@@ -51,3 +51,15 @@ class UserResponse(UserBase):
 
     class Config:
         from_attributes = True
+
+
+class CurrentUser(BaseModel):
+    """The fields authorization needs, cached per user so auth does not hit the users table."""
+
+    id: int
+    role: str
+    is_active: bool
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,170 @@
+import json
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Tuple
+import redis
+from sqlalchemy import Float, Select, func, insert, select, tuple_
+from sqlalchemy.dialects.postgresql import Insert, insert as pg_insert
+from app.core.config import settings
+from app.core.database import after_commit, mark_recent_write
+from app.core.redis_client import INVALIDATION_CHANNEL, CachePipeline, redis_client, version_key
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.models.task_event import TaskEvent
+
+CounterBucket = Tuple[int, str, str, bool]
+
+# Task ids scored by the epoch second their due-date reminder should go out.
+REMINDERS_KEY = "reminders:due"
+
+
+def tasks_namespace(user_id: int) -> str:
+    return f"tasks:user:{user_id}"
+
+
+def task_cache_key(task_id: int) -> str:
+    return f"task:{task_id}"
+
+
+def task_stream_key(user_id: int) -> str:
+    return f"tasks:stream:user:{user_id}"
+
+
+def invalidate_task_caches(pipe: CachePipeline, user_id: int, task_ids: Iterable[int] = ()):
+    """Drop cached task bodies and orphan the owner's list pages; call once per write, however many rows it touched."""
+    pipe.delete(*(task_cache_key(task_id) for task_id in task_ids))
+    pipe.bump_version(tasks_namespace(user_id))
+    mark_recent_write(pipe, user_id)
+
+
+def invalidate_task_caches_sync(client: redis.Redis, user_ids: Iterable[int], task_ids: Iterable[int] = ()):
+    """Worker-side invalidate_task_caches for many owners in one round trip, including the API's L1 tiers."""
+    keys = [task_cache_key(task_id) for task_id in task_ids]
+    namespaces = [version_key(tasks_namespace(user_id)) for user_id in user_ids]
+    with client.pipeline(transaction=False) as pipe:
+        if keys:
+            pipe.delete(*keys)
+        for namespace in namespaces:
+            pipe.incr(namespace)
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps({"src": "worker", "keys": keys + namespaces}))
+        pipe.execute()
+
+
+# Rows from before the columns had defaults may hold NULLs; they are counted as the defaults,
+# as migration 20261018_002 backfilled them. Keep the two in sync.
+COUNTER_BUCKET_COLUMNS = (
+    Task.owner_id,
+    func.coalesce(Task.status, "pending"),
+    func.coalesce(Task.priority, "medium"),
+    func.coalesce(Task.is_archived, False),
+)
+
+
+def counter_bucket(task) -> CounterBucket:
+    """The task_counters row a task (or a row with the same attributes) is counted in."""
+    return (task.owner_id, task.status or "pending", task.priority or "medium", bool(task.is_archived))
+
+
+def counter_deltas(removed: Iterable[CounterBucket] = (), added: Iterable[CounterBucket] = ()) -> Counter:
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    return deltas
+
+
+def counter_upsert(deltas: Counter) -> Optional[Insert]:
+    """One INSERT .. ON CONFLICT adding `deltas` to task_counters, or None when nothing changed.
+
+    Rows are sorted so concurrent writers lock buckets in the same order and cannot deadlock.
+    Run it in the same transaction as the task write so the counters commit or roll back with it.
+    """
+    rows = [
+        {"owner_id": owner_id, "status": status, "priority": priority, "is_archived": is_archived, "count": delta}
+        for (owner_id, status, priority, is_archived), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return None
+    stmt = pg_insert(TaskCounter).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[TaskCounter.owner_id, TaskCounter.status, TaskCounter.priority, TaskCounter.is_archived],
+        set_={"count": TaskCounter.count + stmt.excluded.count},
+    )
+
+
+async def apply_counter_deltas(db, removed: Iterable[CounterBucket] = (), added: Iterable[CounterBucket] = ()):
+    stmt = counter_upsert(counter_deltas(removed, added))
+    if stmt is not None:
+        await db.execute(stmt)
+
+
+async def record_task_events(db, owner_id: int, task_ids: Iterable[int], event: str):
+    """Add outbox rows to the caller's transaction and queue the owner's change feed entries for after it commits.
+
+    Feed entries go out only once the change is visible, so a client refetching on an event never
+    reads the old row. They are best effort; the outbox rows are the durable record.
+    """
+    rows = [{"owner_id": owner_id, "task_id": task_id, "event": event} for task_id in task_ids]
+    if not rows:
+        return
+    await db.execute(insert(TaskEvent), rows)
+    at = datetime.now(timezone.utc).isoformat()
+    entries = [{"task_id": str(row["task_id"]), "event": event, "at": at} for row in rows]
+
+    async def publish():
+        await redis_client.append_stream(task_stream_key(owner_id), entries, settings.TASK_STREAM_MAXLEN, settings.TASK_STREAM_TTL)
+
+    after_commit(db, publish)
+
+
+def search_tasks_query(owner_id: int, q: str, archived: bool = False, after: Optional[Tuple[float, int]] = None) -> Select:
+    """Select (Task, rank) rows matching the web-style query `q`, best match first.
+
+    The match runs against ix_tasks_search_vector; ordering is (rank, id) descending, so `after`
+    is the (rank, id) of the last row on the previous page.
+    """
+    tsquery = func.websearch_to_tsquery("english", q)
+    rank = func.ts_rank_cd(Task.search_vector, tsquery, type_=Float).label("rank")
+    stmt = (
+        select(Task, rank)
+        .where(Task.owner_id == owner_id, Task.is_archived == archived, Task.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), Task.id.desc())
+    )
+    if after:
+        stmt = stmt.where(tuple_(rank, Task.id) < after)
+    return stmt
+
+
+def needs_reminder(task) -> bool:
+    return task.due_date is not None and task.status != "completed" and not task.is_archived and task.due_date.timestamp() > time.time()
+
+
+def reminder_score(task, catch_up: bool = False) -> Optional[float]:
+    """When to send the due-date reminder of a task that needs one, or None to leave its entry as is.
+
+    A reminder whose lead window has already opened is only (re)scheduled when `catch_up` is set,
+    i.e. the task was just created or its due date just changed, so other edits never repeat it.
+    """
+    now = time.time()
+    remind_at = task.due_date.timestamp() - settings.REMINDER_LEAD_MINUTES * 60
+    if remind_at > now:
+        return remind_at
+    return now if catch_up else None
+
+
+def schedule_reminders(pipe: CachePipeline, tasks: Iterable, catch_up: bool = False):
+    """Add, move or drop the reminder entries of tasks that were just written."""
+    scheduled, unscheduled = {}, []
+    for task in tasks:
+        if not needs_reminder(task):
+            unscheduled.append(str(task.id))
+            continue
+        score = reminder_score(task, catch_up)
+        if score is not None:
+            scheduled[str(task.id)] = score
+    pipe.zadd(REMINDERS_KEY, scheduled)
+    unschedule_reminders(pipe, unscheduled)
+
+
+def unschedule_reminders(pipe: CachePipeline, task_ids: Iterable):
+    pipe.zrem(REMINDERS_KEY, *(str(task_id) for task_id in task_ids))
@@ -1,11 +1,14 @@
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_shutdown, worker_ready
 from app.core.config import settings
+from app.core.metrics import mark_worker_exited, start_metrics_server
 
 celery_app = Celery(
     "scalable_api",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.email_tasks", "app.tasks.report_tasks"],
+    include=["app.tasks.email_tasks", "app.tasks.report_tasks", "app.tasks.reminder_tasks", "app.tasks.outbox_tasks"],
 )
 
 celery_app.conf.update(
@@ -17,12 +20,36 @@ celery_app.conf.update(
     task_routes={
         "app.tasks.email_tasks.*": {"queue": "email"},
         "app.tasks.report_tasks.*": {"queue": "reports"},
+        "app.tasks.reminder_tasks.*": {"queue": "default"},
+        "app.tasks.outbox_tasks.*": {"queue": "default"},
+        "app.tasks.notify*": {"queue": "email"},
     },
     beat_schedule={
         "archive-old-tasks": {
             "task": "app.tasks.report_tasks.archive_old_tasks",
             "schedule": 86400,
         },
+        "reconcile-task-counters": {
+            "task": "app.tasks.report_tasks.reconcile_task_counters",
+            "schedule": crontab(minute=30, hour=3),
+        },
+        "dispatch-due-reminders": {
+            "task": "app.tasks.reminder_tasks.dispatch_due_reminders",
+            "schedule": 60,
+        },
+        "rebuild-reminder-schedule": {
+            "task": "app.tasks.reminder_tasks.rebuild_reminder_schedule",
+            "schedule": crontab(minute=45, hour=3),
+        },
+        "relay-task-events": {
+            "task": "app.tasks.outbox_tasks.relay_task_events",
+            "schedule": settings.OUTBOX_RELAY_INTERVAL,
+            "options": {"expires": settings.OUTBOX_RELAY_INTERVAL},
+        },
+        "weekly-reports": {
+            "task": "app.tasks.report_tasks.schedule_weekly_reports",
+            "schedule": crontab(minute=0, hour=6, day_of_week="mon"),
+        },
     },
 )
 
@@ -34,3 +61,26 @@ def send_task_notification(self, user_id: int, task_id: int, event: str):
         return {"status": "sent", "task_id": task_id}
     except Exception as exc:
         raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+
+@celery_app.task(name="app.tasks.notify_batch", bind=True, max_retries=3)
+def send_task_notifications(self, user_id: int, events: list):
+    """One message per user per relay batch; events are dicts with task_id, event and at."""
+    try:
+        summary = ", ".join(f"{e['event']}:{e['task_id']}" for e in events)
+        print(f"📧 Notifications: user={user_id}, events={len(events)} [{summary}]")
+        return {"status": "sent", "events": len(events)}
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries) from exc
+
+
+@worker_ready.connect
+def start_worker_metrics(**_):
+    if settings.WORKER_METRICS_PORT:
+        start_metrics_server(settings.WORKER_METRICS_PORT)
+        print(f"📈 Worker metrics on :{settings.WORKER_METRICS_PORT}")
+
+
+@worker_process_shutdown.connect
+def forget_worker_process(**_):
+    mark_worker_exited()
@@ -0,0 +1,71 @@
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+from sqlalchemy import delete, select
+from app.core.config import settings
+from app.core.database import SyncSessionLocal
+from app.core.metrics import OUTBOX_DELIVERY_LAG_SECONDS, OUTBOX_EVENTS_RELAYED, OUTBOX_MESSAGES_PUBLISHED
+from app.models.task_event import TaskEvent
+from app.tasks.celery_app import celery_app, send_task_notifications
+
+
+def group_events_by_owner(rows) -> Dict[int, List[dict]]:
+    """(id, owner_id, task_id, event, created_at) rows -> one payload list per owner, oldest first."""
+    grouped: Dict[int, List[dict]] = defaultdict(list)
+    for _, owner_id, task_id, event, created_at in rows:
+        grouped[owner_id].append({"task_id": task_id, "event": event, "at": created_at.isoformat()})
+    return dict(grouped)
+
+
+@celery_app.task(name="app.tasks.outbox_tasks.relay_task_events")
+def relay_task_events():
+    """Beat entry point: publish committed task events to the notification queue.
+
+    Claims OUTBOX_BATCH_SIZE rows at a time with FOR UPDATE SKIP LOCKED, so overlapping relays
+    split the backlog instead of queueing behind each other, sends one message per owner and
+    deletes the rows in the transaction that claimed them. Delivery is at-least-once: a relay that
+    dies after publishing but before committing leaves its batch to be sent again.
+    """
+    started = time.monotonic()
+    relayed, batches, max_lag = 0, 0, 0.0
+    with SyncSessionLocal() as session, celery_app.producer_or_acquire() as producer:
+        while True:
+            stmt = (
+                select(TaskEvent.id, TaskEvent.owner_id, TaskEvent.task_id, TaskEvent.event, TaskEvent.created_at)
+                .order_by(TaskEvent.id)
+                .limit(settings.OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            rows = session.execute(stmt).all()
+            if not rows:
+                session.rollback()
+                break
+            grouped = group_events_by_owner(rows)
+            for owner_id, events in grouped.items():
+                send_task_notifications.apply_async((owner_id, events), producer=producer)
+            session.execute(delete(TaskEvent).where(TaskEvent.id.in_([row.id for row in rows])))
+            session.commit()
+
+            now = datetime.now(timezone.utc)
+            for row in rows:
+                lag = (now - row.created_at).total_seconds()
+                OUTBOX_DELIVERY_LAG_SECONDS.observe(lag)
+                max_lag = max(max_lag, lag)
+            OUTBOX_EVENTS_RELAYED.inc(len(rows))
+            OUTBOX_MESSAGES_PUBLISHED.inc(len(grouped))
+            relayed += len(rows)
+            batches += 1
+            if len(rows) < settings.OUTBOX_BATCH_SIZE:
+                break
+
+    elapsed = time.monotonic() - started
+    if relayed:
+        print(f"📤 Relayed {relayed} task events in {batches} batches ({elapsed:.2f}s, max lag {max_lag:.1f}s)")
+    return {
+        "status": "relayed",
+        "events": relayed,
+        "batches": batches,
+        "max_lag_seconds": round(max_lag, 3),
+        "events_per_second": round(relayed / elapsed, 1) if elapsed else 0.0,
+    }
@@ -0,0 +1,89 @@
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, tuple_
+from app.core.config import settings
+from app.core.database import SyncSessionLocal
+from app.core.redis_client import sync_redis
+from app.models.task import Task
+from app.services.task_service import REMINDERS_KEY
+from app.tasks.celery_app import celery_app
+from app.tasks.email_tasks import send_due_date_reminder
+
+# Atomically takes up to ARGV[2] members scored at or before ARGV[1], so concurrent dispatchers never share one.
+POP_DUE_SCRIPT = """
+local ids = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+if #ids > 0 then
+    redis.call("ZREM", KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+# Matches the ix_tasks_due_date_open predicate so the planner can use the partial index.
+OPEN_TASK = (Task.status != "completed", ~Task.is_archived)
+
+
+@celery_app.task(name="app.tasks.reminder_tasks.dispatch_due_reminders")
+def dispatch_due_reminders():
+    """Beat entry point: enqueue every reminder that has come due, in chunks.
+
+    Pops REMINDER_BATCH_SIZE task ids at a time from the reminders:due sorted set, so a tick
+    costs time proportional to the reminders due rather than to the size of the tasks table.
+    Popped ids are checked against the database, which drops entries made stale by edits.
+    """
+    client = sync_redis()
+    pop_due = client.register_script(POP_DUE_SCRIPT)
+    horizon = datetime.now(timezone.utc) + timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+    dispatched, batches = 0, 0
+    while True:
+        now = time.time()
+        ids = [int(task_id) for task_id in pop_due(keys=[REMINDERS_KEY], args=[now, settings.REMINDER_BATCH_SIZE])]
+        if not ids:
+            break
+        batches += 1
+        with SyncSessionLocal() as session:
+            stmt = select(Task.owner_id, Task.id, Task.title).where(
+                Task.id.in_(ids), *OPEN_TASK, Task.due_date > datetime.now(timezone.utc), Task.due_date <= horizon
+            )
+            reminders = [tuple(row) for row in session.execute(stmt)]
+        try:
+            if reminders:
+                send_due_date_reminder.chunks(reminders, settings.REMINDER_CHUNK_SIZE).apply_async(queue="email")
+        except Exception:
+            # Put the batch back so the next tick retries it instead of silently dropping reminders.
+            client.zadd(REMINDERS_KEY, {str(task_id): now for task_id in ids})
+            raise
+        dispatched += len(reminders)
+        if len(ids) < settings.REMINDER_BATCH_SIZE:
+            break
+    if dispatched:
+        print(f"⏰ Dispatched {dispatched} due-date reminders in {batches} batches")
+    return {"status": "dispatched", "reminders": dispatched, "batches": batches}
+
+
+@celery_app.task(name="app.tasks.reminder_tasks.rebuild_reminder_schedule")
+def rebuild_reminder_schedule():
+    """Daily job: re-add reminders for every open task whose reminder is still ahead.
+
+    Repairs entries lost to a Redis flush or a failed write. Walks ix_tasks_due_date_open in
+    REMINDER_BATCH_SIZE keyset pages; reminders already due are left alone so none is repeated.
+    """
+    client = sync_redis()
+    lead = timedelta(minutes=settings.REMINDER_LEAD_MINUTES)
+    after = (datetime.now(timezone.utc) + lead, 0)
+    scheduled = 0
+    with SyncSessionLocal() as session:
+        while True:
+            stmt = (
+                select(Task.id, Task.due_date)
+                .where(*OPEN_TASK, tuple_(Task.due_date, Task.id) > after)
+                .order_by(Task.due_date, Task.id)
+                .limit(settings.REMINDER_BATCH_SIZE)
+            )
+            rows = session.execute(stmt).all()
+            if not rows:
+                break
+            client.zadd(REMINDERS_KEY, {str(task_id): (due_date - lead).timestamp() for task_id, due_date in rows})
+            scheduled += len(rows)
+            after = (rows[-1].due_date, rows[-1].id)
+    print(f"⏰ Rebuilt reminder schedule: {scheduled} upcoming reminders")
+    return {"status": "done", "scheduled": scheduled}
@@ -1,15 +1,183 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import Select, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SyncSessionLocal
+from app.core.redis_client import sync_redis
+from app.models.task import Task
+from app.models.task_counter import TaskCounter
+from app.models.task_event import TaskEvent
+from app.models.user import User
+from app.services.task_service import COUNTER_BUCKET_COLUMNS, counter_deltas, counter_upsert, invalidate_task_caches_sync
 from app.tasks.celery_app import celery_app
 
+ARCHIVE_CHECKPOINT_KEY = "jobs:archive_old_tasks:checkpoint"
+
+
+def aggregate_reports(session: Session, *conditions) -> dict[int, dict]:
+    """Per-owner status/priority/overdue counts for every owner matching `conditions`, in one grouped query."""
+    overdue = func.count().filter(Task.due_date < func.now(), Task.status != "completed")
+    stmt = (
+        select(Task.owner_id, Task.status, Task.priority, func.count(), overdue)
+        .where(Task.is_archived.is_(False), *conditions)
+        .group_by(Task.owner_id, Task.status, Task.priority)
+    )
+    reports: dict[int, dict] = {}
+    for owner_id, status, priority, total, overdue_count in session.execute(stmt):
+        report = reports.setdefault(owner_id, {"user_id": owner_id, "total": 0, "overdue": 0, "by_status": {}, "by_priority": {}})
+        report["total"] += total
+        report["overdue"] += overdue_count
+        report["by_status"][status] = report["by_status"].get(status, 0) + total
+        report["by_priority"][priority] = report["by_priority"].get(priority, 0) + total
+    return reports
+
+
+def shard_owners(shard: int, shard_count: int) -> Select:
+    """Active users in a report shard.
+
+    The modulo runs over users rather than tasks: no index serves `tasks.owner_id % n`, so filtering
+    tasks that way scans the whole table once per shard, while this lets ix_tasks_owner_id fetch
+    just the shard's tasks.
+    """
+    return select(User.id).where(User.is_active.is_(True), User.id % shard_count == shard)
+
+
+@celery_app.task(name="app.tasks.report_tasks.schedule_weekly_reports")
+def schedule_weekly_reports():
+    """Weekly beat entry point: one aggregation task per user shard instead of one message per user."""
+    for shard in range(settings.REPORT_SHARDS):
+        generate_weekly_reports.delay(shard, settings.REPORT_SHARDS)
+    return {"status": "scheduled", "shards": settings.REPORT_SHARDS}
+
+
+@celery_app.task(name="app.tasks.report_tasks.generate_weekly_reports")
+def generate_weekly_reports(shard: int, shard_count: int):
+    """Aggregate a shard of users in one query and fan the reports out in batches for delivery."""
+    with SyncSessionLocal() as session:
+        reports = list(aggregate_reports(session, Task.owner_id.in_(shard_owners(shard, shard_count))).values())
+    for start in range(0, len(reports), settings.REPORT_BATCH_SIZE):
+        deliver_weekly_reports.delay(reports[start:start + settings.REPORT_BATCH_SIZE])
+    print(f"📊 Generated {len(reports)} weekly reports for shard {shard}/{shard_count}")
+    return {"status": "generated", "shard": shard, "reports": len(reports)}
+
+
+@celery_app.task(name="app.tasks.report_tasks.deliver_weekly_reports")
+def deliver_weekly_reports(reports: list[dict]):
+    """Email a batch of weekly summaries."""
+    for report in reports:
+        print(f"📊 Weekly report for user {report['user_id']}: {report['total']} open tasks, {report['overdue']} overdue")
+    # Add real email logic here e.g. SendGrid, Resend, etc.
+    return {"status": "sent", "reports": len(reports)}
+
 
 @celery_app.task(name="app.tasks.report_tasks.generate_weekly_report")
 def generate_weekly_report(user_id: int):
-    """Generate and email a weekly task summary."""
+    """Generate and email a weekly task summary for a single user."""
+    with SyncSessionLocal() as session:
+        report = aggregate_reports(session, Task.owner_id == user_id).get(user_id)
+    if report:
+        deliver_weekly_reports.delay([report])
     print(f"📊 Generating weekly report for user {user_id}")
     return {"status": "generated", "user_id": user_id}
 
 
 @celery_app.task(name="app.tasks.report_tasks.archive_old_tasks")
 def archive_old_tasks():
-    """Daily job: archive tasks completed more than 30 days ago."""
-    print("🗄️  Archiving old completed tasks...")
-    return {"status": "done"}
+    """Daily job: archive tasks completed more than ARCHIVE_AFTER_DAYS ago.
+
+    Walks the primary key in ARCHIVE_CHUNK_SIZE ranges, committing and checkpointing each one so
+    no statement locks more than a chunk of rows and a crashed run resumes where it stopped.
+    """
+    client = sync_redis()
+    checkpoint = json.loads(client.get(ARCHIVE_CHECKPOINT_KEY) or "null")
+    if checkpoint:
+        cutoff = datetime.fromisoformat(checkpoint["cutoff"])
+        last_id, archived = checkpoint["last_id"], checkpoint["archived"]
+        print(f"🗄️  Resuming archive run from task id {last_id}...")
+    else:
+        cutoff, last_id, archived = datetime.now(timezone.utc) - timedelta(days=settings.ARCHIVE_AFTER_DAYS), 0, 0
+        print("🗄️  Archiving old completed tasks...")
+
+    started = time.monotonic()
+    chunks, archived_this_run = 0, 0
+    with SyncSessionLocal() as session:
+        max_id = session.scalar(select(func.max(Task.id))) or 0
+        while last_id < max_id:
+            upper = last_id + settings.ARCHIVE_CHUNK_SIZE
+            stmt = (
+                update(Task)
+                .where(Task.id > last_id, Task.id <= upper)
+                .where(Task.status == "completed", Task.is_archived.is_(False), Task.updated_at < cutoff)
+                .values(is_archived=True)
+                .returning(Task.id, Task.owner_id, Task.status, Task.priority)
+            )
+            rows = session.execute(stmt, execution_options={"synchronize_session": False}).all()
+            removed = [(row.owner_id, row.status, row.priority or "medium", False) for row in rows]
+            added = [(row.owner_id, row.status, row.priority or "medium", True) for row in rows]
+            counters = counter_upsert(counter_deltas(removed, added))
+            if counters is not None:
+                session.execute(counters)
+            if rows:
+                session.execute(insert(TaskEvent), [{"owner_id": row.owner_id, "task_id": row.id, "event": "archived"} for row in rows])
+            session.commit()
+
+            if rows:
+                invalidate_task_caches_sync(client, {row.owner_id for row in rows}, [row.id for row in rows])
+            last_id, chunks = upper, chunks + 1
+            archived, archived_this_run = archived + len(rows), archived_this_run + len(rows)
+            checkpoint = {"cutoff": cutoff.isoformat(), "last_id": last_id, "archived": archived}
+            client.set(ARCHIVE_CHECKPOINT_KEY, json.dumps(checkpoint), ex=2 * 86400)
+            time.sleep(settings.ARCHIVE_THROTTLE_SECONDS)
+
+    client.delete(ARCHIVE_CHECKPOINT_KEY)
+    elapsed = time.monotonic() - started
+    print(f"🗄️  Archived {archived} tasks in {chunks} chunks ({elapsed:.1f}s)")
+    return {
+        "status": "done",
+        "archived": archived,
+        "chunks": chunks,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(archived_this_run / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+@celery_app.task(name="app.tasks.report_tasks.reconcile_task_counters")
+def reconcile_task_counters():
+    """Daily job: recount tasks per owner and repair any task_counters drift.
+
+    Each batch locks its owners' counter rows before counting, so writes racing the recount
+    either finish first and are counted or wait and apply their delta on top of the fix.
+    """
+    client = sync_redis()
+    repaired_owners, repaired_buckets = set(), 0
+    with SyncSessionLocal() as session:
+        owner_ids = session.scalars(select(User.id).order_by(User.id)).all()
+        for start in range(0, len(owner_ids), settings.REPORT_BATCH_SIZE):
+            batch = owner_ids[start:start + settings.REPORT_BATCH_SIZE]
+            bucket_columns = (TaskCounter.owner_id, TaskCounter.status, TaskCounter.priority, TaskCounter.is_archived)
+            stored = session.execute(
+                select(*bucket_columns, TaskCounter.count)
+                .where(TaskCounter.owner_id.in_(batch))
+                .order_by(*bucket_columns)
+                .with_for_update()
+            ).all()
+            actual = session.execute(
+                select(*COUNTER_BUCKET_COLUMNS, func.count()).where(Task.owner_id.in_(batch)).group_by(*COUNTER_BUCKET_COLUMNS)
+            ).all()
+            drift = counter_deltas(
+                removed={tuple(bucket): count for *bucket, count in stored},
+                added={tuple(bucket): count for *bucket, count in actual},
+            )
+            drift = {bucket: delta for bucket, delta in drift.items() if delta}
+            if drift:
+                session.execute(counter_upsert(drift))
+                repaired_owners.update(owner_id for owner_id, *_ in drift)
+                repaired_buckets += len(drift)
+            session.commit()
+
+    if repaired_owners:
+        invalidate_task_caches_sync(client, repaired_owners)
+    print(f"🧮 Reconciled task counters for {len(owner_ids)} users, repaired {repaired_buckets} buckets")
+    return {"status": "done", "users": len(owner_ids), "repaired_users": len(repaired_owners), "repaired_buckets": repaired_buckets}
@@ -0,0 +1,34 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values that version a representation (cache generation, updated_at, ...)."""
+    return f'"{hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def encode_body(model: BaseModel, etag: Optional[str] = None, **meta: Any) -> dict:
+    """Serialize a response model once, for caching alongside its ETag and any lookup metadata.
+
+    The body is kept as text so every cache codec stores it verbatim; JSON has no bytes type.
+    """
+    body = model.model_dump_json()
+    return {"body": body, "etag": etag or f'"{hashlib.blake2b(body.encode(), digest_size=16).hexdigest()}"', **meta}
+
+
+def cached_response(entry: dict, status_code: int = 200) -> Response:
+    """Return a cached body as-is, bypassing response_model validation and re-serialization."""
+    return Response(content=entry["body"], status_code=status_code, media_type="application/json", headers={"ETag": entry["etag"]})
@@ -0,0 +1,74 @@
+from collections.abc import AsyncIterable
+from typing import Optional
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# Sent as Content-Encoding so GZipMiddleware passes frames through instead of buffering them in the compressor.
+SSE_HEADERS = {"Cache-Control": "no-cache", "Content-Encoding": "identity", "X-Accel-Buffering": "no"}
+
+
+def sse_frame(data: Optional[str] = None, event: Optional[str] = None, id: Optional[str] = None, retry: Optional[int] = None) -> str:
+    """One event-stream frame; a frame without data only updates the client's last id or retry delay."""
+    lines = []
+    if id is not None:
+        lines.append(f"id: {id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if data is not None:
+        lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_comment(text: str) -> str:
+    """A frame clients ignore; keeps idle connections from being closed by proxies."""
+    return f": {text}\n\n"
+
+
+def stream_id_key(entry_id: str) -> tuple[int, int]:
+    """Redis stream ids ("<ms>-<seq>") in comparable form; raises ValueError for anything else."""
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class StreamSlots:
+    """Caps long-lived streams per worker so they cannot take every connection from ordinary requests."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.open = 0
+        self.served = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        if self.open >= self.limit:
+            self.rejected += 1
+            return False
+        self.open += 1
+        self.served += 1
+        return True
+
+    def release(self):
+        self.open -= 1
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "open": self.open, "served": self.served, "rejected": self.rejected}
+
+
+class EventStreamResponse(StreamingResponse):
+    """An event stream holding a StreamSlots slot, released however the response ends.
+
+    Releasing in the body generator is not enough: a client that disconnects before the first frame
+    cancels the response before the generator ever starts, so its finally block never runs.
+    """
+
+    def __init__(self, content: AsyncIterable[str], slots: StreamSlots):
+        super().__init__(content, media_type="text/event-stream", headers=SSE_HEADERS)
+        self.slots = slots
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.slots.release()
@@ -0,0 +1,60 @@
+"""Compare cache entry size and decode cost of the legacy JSON path against CacheCodec formats.
+
+Usage: python -m scripts.bench_cache_codec [--tasks 100] [--iterations 2000]
+
+Uses a list_tasks-shaped payload; no Redis connection is needed. Entry size is the number of
+bytes Redis stores for the value.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from app.core.cache_codec import CacheCodec
+
+
+def build_payload(count: int) -> dict:
+    now = datetime.now(timezone.utc)
+    tasks = [
+        {
+            "id": i,
+            "title": f"Follow up on customer ticket #{i}",
+            "description": "Reproduce the reported issue, capture logs and attach them to the ticket. " * 3,
+            "priority": "medium",
+            "due_date": None,
+            "status": "pending",
+            "is_archived": False,
+            "owner_id": 1,
+            "assigned_to_id": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+    return {"tasks": tasks, "total": count, "page": 1, "per_page": count, "pages": 1, "next_cursor": None}
+
+
+def bench(name: str, encode, decode, payload: dict, iterations: int):
+    encoded = encode(payload)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(encoded)
+    decode_us = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{name:<16} {len(encoded):>10} {decode_us:>12.1f}")
+
+
+def main(count: int, iterations: int):
+    payload = build_payload(count)
+    print(f"{'format':<16} {'bytes':>10} {'decode us':>12}")
+    bench("legacy json", lambda v: json.dumps(v, default=str), json.loads, payload, iterations)
+    for compression in ("none", "zlib", "zstd"):
+        codec = CacheCodec("msgpack", compression)
+        bench(f"msgpack+{compression}", codec.encode, codec.decode, payload, iterations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.tasks, args.iterations)
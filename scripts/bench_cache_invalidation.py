@@ -0,0 +1,66 @@
+"""Compare KEYS-based pattern invalidation with namespace version bumps.
+
+Usage: python -m scripts.bench_cache_invalidation [--sizes 10000 100000 500000] [--rounds 20]
+
+Fills the Redis database from REDIS_URL with unrelated keys, then times invalidating one
+user's list cache both ways. Only run it against a disposable Redis: the database is flushed.
+"""
+
+import argparse
+import asyncio
+import time
+from app.core.redis_client import redis_client
+
+USER_ID = 1
+USER_KEYS = 50
+
+
+async def fill(size: int):
+    client = redis_client._client
+    await client.flushdb()
+    for start in range(0, size, 10_000):
+        async with client.pipeline(transaction=False) as pipe:
+            for i in range(start, min(start + 10_000, size)):
+                pipe.set(f"task:{i}", "x", ex=600)
+            await pipe.execute()
+
+
+async def time_pattern(rounds: int) -> float:
+    elapsed = 0.0
+    for _ in range(rounds):
+        for i in range(USER_KEYS):
+            await redis_client.set(f"tasks:user:{USER_ID}:p{i}", {"tasks": []})
+        start = time.perf_counter()
+        await redis_client.delete_pattern(f"tasks:user:{USER_ID}:*")
+        elapsed += time.perf_counter() - start
+    return elapsed / rounds * 1000
+
+
+async def time_version(rounds: int) -> float:
+    elapsed = 0.0
+    for _ in range(rounds):
+        version = await redis_client.get_version(f"tasks:user:{USER_ID}")
+        for i in range(USER_KEYS):
+            await redis_client.set(f"tasks:user:{USER_ID}:v{version}:p{i}", {"tasks": []})
+        start = time.perf_counter()
+        await redis_client.bump_version(f"tasks:user:{USER_ID}")
+        elapsed += time.perf_counter() - start
+    return elapsed / rounds * 1000
+
+
+async def main(sizes: list[int], rounds: int):
+    await redis_client.connect()
+    print(f"{'keyspace':>10} {'KEYS+DEL ms':>12} {'INCR ms':>9}")
+    for size in sizes:
+        await fill(size)
+        print(f"{size:>10} {await time_pattern(rounds):>12.3f} {await time_version(rounds):>9.3f}")
+    await redis_client._client.flushdb()
+    await redis_client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.rounds))
@@ -0,0 +1,46 @@
+"""Per-request cost of the rate limiter: the Redis token-bucket script and the local fallback.
+
+Usage: python -m scripts.bench_rate_limit [--iterations 5000] [--keys 1000]
+
+Needs the Redis at REDIS_URL for the first line; the local fallback is measured in-process.
+Each call takes one token from one of `--keys` buckets, sized so no call is rejected.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from app.core.rate_limit import LocalTokenBuckets, TOKEN_BUCKET_SCRIPT
+from app.core.redis_client import redis_client
+
+
+def summarize(label: str, samples: list[float]):
+    quantiles = statistics.quantiles(samples, n=100)
+    print(f"{label:<14} p50={quantiles[49]:7.1f}us p99={quantiles[98]:7.1f}us")
+
+
+async def main(iterations: int, keys: int):
+    await redis_client.connect()
+    capacity, period = iterations, 60
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await redis_client.run_script(TOKEN_BUCKET_SCRIPT, [f"ratelimit:bench:{i % keys}"], [capacity, capacity / (period * 1000)])
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    summarize("redis script", samples)
+    await redis_client.close()
+
+    buckets, samples = LocalTokenBuckets(keys), []
+    for i in range(iterations):
+        start = time.perf_counter()
+        buckets.take(f"ratelimit:bench:{i % keys}", capacity, period)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    summarize("local fallback", samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.keys))
@@ -0,0 +1,59 @@
+"""Latency of ranked full-text task search against the ILIKE scan it replaces.
+
+Usage: python -m scripts.bench_task_search [--terms invoice,deploy,customer] [--runs 20] [--per-page 20]
+
+Runs read-only queries against DATABASE_URL_SYNC for the user owning the most tasks; seed a
+million-row dataset first (python -m scripts.seed_db) so both plans see production-sized data.
+"""
+
+import argparse
+import statistics
+import time
+from sqlalchemy import func, or_, select
+from app.core.database import SyncSessionLocal
+from app.models.task import Task
+from app.services.task_service import search_tasks_query
+
+
+def timed(session, stmt, runs: int) -> tuple[list[float], int]:
+    samples, rows = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = len(session.execute(stmt).all())
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, rows
+
+
+def report(label: str, samples: list[float], rows: int):
+    quantiles = statistics.quantiles(samples, n=100)
+    print(f"  {label:<10} p50={quantiles[49]:8.2f}ms p99={quantiles[98]:8.2f}ms rows={rows}")
+
+
+def main(terms: list[str], runs: int, per_page: int):
+    with SyncSessionLocal() as session:
+        total = session.scalar(select(func.count(Task.id)))
+        owner_id, owned = session.execute(
+            select(Task.owner_id, func.count()).group_by(Task.owner_id).order_by(func.count().desc()).limit(1)
+        ).one()
+        print(f"tasks: {total}, benchmarking owner {owner_id} with {owned} tasks")
+        for term in terms:
+            pattern = f"%{term}%"
+            scan = (
+                select(Task)
+                .where(Task.owner_id == owner_id, Task.is_archived.is_(False))
+                .where(or_(Task.title.ilike(pattern), Task.description.ilike(pattern)))
+                .order_by(Task.id.desc())
+                .limit(per_page)
+            )
+            print(f"q={term!r}")
+            report("ilike", *timed(session, scan, runs))
+            report("fulltext", *timed(session, search_tasks_query(owner_id, term).limit(per_page + 1), runs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terms", default="invoice,deploy,customer")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--per-page", type=int, default=20)
+    args = parser.parse_args()
+    main(args.terms.split(","), args.runs, args.per_page)
@@ -0,0 +1,43 @@
+"""Compare per-user report queries with the grouped per-shard aggregation.
+
+Usage: python -m scripts.bench_weekly_reports [--shards 16] [--shard 0]
+
+Runs read-only queries against DATABASE_URL_SYNC; seed it first (python -m scripts.seed_db)
+so the numbers reflect production-sized data.
+"""
+
+import argparse
+import time
+from sqlalchemy import distinct, select
+from app.core.database import SyncSessionLocal
+from app.models.task import Task
+from app.tasks.report_tasks import aggregate_reports
+
+
+def main(shards: int, shard: int):
+    with SyncSessionLocal() as session:
+        in_shard = Task.owner_id % shards == shard
+        user_ids = session.scalars(select(distinct(Task.owner_id)).where(in_shard)).all()
+
+        start = time.perf_counter()
+        per_user = {}
+        for user_id in user_ids:
+            per_user.update(aggregate_reports(session, Task.owner_id == user_id))
+        per_user_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        grouped = aggregate_reports(session, in_shard)
+        grouped_seconds = time.perf_counter() - start
+
+    assert per_user == grouped, "per-user and grouped aggregates disagree"
+    print(f"users in shard {shard}/{shards}: {len(user_ids)}")
+    print(f"per-user queries: {per_user_seconds:8.3f}s ({len(user_ids)} queries)")
+    print(f"grouped query:    {grouped_seconds:8.3f}s (1 query, {per_user_seconds / max(grouped_seconds, 1e-9):.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--shard", type=int, default=0)
+    args = parser.parse_args()
+    main(args.shards, args.shard)
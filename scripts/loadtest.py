@@ -0,0 +1,197 @@
+"""Drive a running API with a scenario profile and report per-endpoint throughput, latency and errors as JSON.
+
+Usage: python -m scripts.loadtest --profile read-heavy [--base-url http://localhost:8000] [--users 50] [--duration 60] [--output run.json]
+
+Virtual users log in as accounts created by scripts.seed_db (<prefix><n>@example.com), so seed
+first and use the same --prefix. Profiles:
+
+  read-heavy    front-end polling: task list with If-None-Match, single tasks, stats and search
+  login-storm   every virtual user logs in back to back
+  write-burst   creates, updates, bulk creates and deletes of the user's own tasks
+
+Keys in the report are sorted, so two runs can be compared with a plain diff. Rate-limited (429)
+responses count as errors; disable RATE_LIMIT_ENABLED on the target to measure raw capacity.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import httpx
+
+API = "/api/v1"
+SEARCH_TERMS = ["invoice", "deploy", "customer", "report", "budget", "release"]
+
+
+class Recorder:
+    """Latencies and status codes per endpoint template, e.g. "GET /api/v1/tasks/{task_id}"."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client: httpx.AsyncClient, method: str, label: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        endpoint = f"{method} {label}"
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = str(response.status_code)
+        except httpx.HTTPError as exc:
+            response, status = None, type(exc).__name__
+        self.latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        self.statuses[endpoint][status] += 1
+        return response
+
+
+def percentile(samples: List[float], q: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100)[q - 1]
+
+
+def is_error(status: str) -> bool:
+    return not status.isdigit() or int(status) >= 400
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints, total_errors = {}, 0
+    for endpoint, samples in recorder.latencies.items():
+        errors = sum(count for status, count in recorder.statuses[endpoint].items() if is_error(status))
+        total_errors += errors
+        endpoints[endpoint] = {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+            "error_rate": round(errors / len(samples), 4),
+            "statuses": dict(recorder.statuses[endpoint]),
+        }
+    requests = sum(e["requests"] for e in endpoints.values())
+    all_samples = [sample for samples in recorder.latencies.values() for sample in samples]
+    totals = {"requests": requests, "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0}
+    if all_samples:
+        totals.update(
+            p50_ms=round(percentile(all_samples, 50), 2),
+            p95_ms=round(percentile(all_samples, 95), 2),
+            p99_ms=round(percentile(all_samples, 99), 2),
+            error_rate=round(total_errors / requests, 4),
+        )
+    return {"endpoints": endpoints, "totals": totals}
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, credentials: dict) -> Optional[dict]:
+    response = await recorder.request(client, "POST", f"{API}/auth/login", f"{API}/auth/login", json=credentials)
+    if response is None or response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def read_heavy(client: httpx.AsyncClient, recorder: Recorder, headers: dict, rng: random.Random, deadline: float, think: float):
+    etag, task_ids = None, []
+    while time.monotonic() < deadline:
+        roll = rng.random()
+        if roll < 0.6 or not task_ids:
+            conditional = {**headers, "If-None-Match": etag} if etag else headers
+            response = await recorder.request(client, "GET", f"{API}/tasks/", f"{API}/tasks/", headers=conditional)
+            if response is not None and response.status_code == 200:
+                etag = response.headers.get("etag")
+                task_ids = [task["id"] for task in response.json()["tasks"]] or task_ids
+        elif roll < 0.8:
+            url = f"{API}/tasks/{rng.choice(task_ids)}"
+            await recorder.request(client, "GET", f"{API}/tasks/{{task_id}}", url, headers=headers)
+        elif roll < 0.93:
+            await recorder.request(client, "GET", f"{API}/tasks/stats", f"{API}/tasks/stats", headers=headers)
+        else:
+            params = {"q": rng.choice(SEARCH_TERMS)}
+            await recorder.request(client, "GET", f"{API}/tasks/search", f"{API}/tasks/search", headers=headers, params=params)
+        await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+
+
+async def write_burst(client: httpx.AsyncClient, recorder: Recorder, headers: dict, rng: random.Random, deadline: float, think: float):
+    created: List[int] = []
+
+    def new_task() -> dict:
+        due = datetime.now(timezone.utc) + timedelta(days=rng.randrange(1, 30))
+        priority = rng.choice(["low", "medium", "high"])
+        return {"title": f"Load test {rng.choice(SEARCH_TERMS)}", "priority": priority, "due_date": due.isoformat()}
+
+    while time.monotonic() < deadline:
+        roll = rng.random()
+        if roll < 0.45 or not created:
+            response = await recorder.request(client, "POST", f"{API}/tasks/", f"{API}/tasks/", headers=headers, json=new_task())
+            if response is not None and response.status_code == 201:
+                created.append(response.json()["id"])
+        elif roll < 0.75:
+            body = {"status": rng.choice(["pending", "in_progress", "completed"])}
+            url = f"{API}/tasks/{rng.choice(created)}"
+            await recorder.request(client, "PATCH", f"{API}/tasks/{{task_id}}", url, headers=headers, json=body)
+        elif roll < 0.85:
+            body = [new_task() for _ in range(50)]
+            response = await recorder.request(client, "POST", f"{API}/tasks/bulk", f"{API}/tasks/bulk", headers=headers, json=body)
+            if response is not None and response.status_code == 200:
+                created.extend(task["id"] for task in response.json()["tasks"])
+        else:
+            url = f"{API}/tasks/{created.pop(rng.randrange(len(created)))}"
+            await recorder.request(client, "DELETE", f"{API}/tasks/{{task_id}}", url, headers=headers)
+        await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+
+
+async def virtual_user(n: int, args, client: httpx.AsyncClient, recorder: Recorder, deadline: float):
+    rng = random.Random(args.seed + n)
+    credentials = {"email": f"{args.prefix}{rng.randrange(args.accounts)}@example.com", "password": args.password}
+    if args.profile == "login-storm":
+        while time.monotonic() < deadline:
+            await login(client, recorder, credentials)
+        return
+    headers = await login(client, recorder, credentials)
+    if headers is None:
+        return
+    scenario = read_heavy if args.profile == "read-heavy" else write_burst
+    await scenario(client, recorder, headers, rng, deadline, args.think)
+
+
+async def main(args) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30, limits=limits) as client:
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(virtual_user(n, args, client, recorder, deadline) for n in range(args.users)))
+        elapsed = time.monotonic() - started
+    return {
+        "run": {
+            "profile": args.profile,
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_s": round(elapsed, 2),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        **summarize(recorder, elapsed),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=["read-heavy", "login-storm", "write-burst"], required=True)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--think", type=float, default=0.5, help="mean seconds between a user's requests; 0 for closed-loop")
+    parser.add_argument("--accounts", type=int, default=10_000, help="seeded accounts to pick users from")
+    parser.add_argument("--prefix", default="seed")
+    parser.add_argument("--password", default="Password123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    report = json.dumps(asyncio.run(main(args)), indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
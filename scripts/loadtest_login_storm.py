@@ -0,0 +1,68 @@
+"""Measure latency of an unrelated endpoint before and during a login storm.
+
+Usage: python -m scripts.loadtest_login_storm --base-url http://localhost:8000 [--logins 50] [--duration 10]
+
+Registers a throwaway user, samples GET /health on its own to get a baseline, then samples it
+again while `--logins` concurrent clients log in back to back. With bcrypt on the event loop,
+p99 of the probe grows with the storm; with the hashing pool it should stay close to the baseline.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import httpx
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list[float]:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.02)
+    return samples
+
+
+async def login_loop(client: httpx.AsyncClient, credentials: dict, stop: asyncio.Event) -> int:
+    logins = 0
+    while not stop.is_set():
+        await client.post("/api/v1/auth/login", json=credentials)
+        logins += 1
+    return logins
+
+
+def summarize(label: str, samples: list[float]):
+    quantiles = statistics.quantiles(samples, n=100)
+    print(f"{label:<14} n={len(samples):<6} p50={quantiles[49]:7.1f}ms p99={quantiles[98]:7.1f}ms")
+
+
+async def main(base_url: str, logins: int, duration: float):
+    suffix = uuid.uuid4().hex[:8]
+    credentials = {"email": f"storm_{suffix}@example.com", "password": "Password123"}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=httpx.Limits(max_connections=logins + 10)) as client:
+        await client.post("/api/v1/auth/register", json={**credentials, "username": f"storm_{suffix}"})
+
+        stop = asyncio.Event()
+        baseline = asyncio.create_task(probe(client, stop))
+        await asyncio.sleep(duration)
+        stop.set()
+        summarize("baseline", await baseline)
+
+        stop = asyncio.Event()
+        storm = [asyncio.create_task(login_loop(client, credentials, stop)) for _ in range(logins)]
+        during = asyncio.create_task(probe(client, stop))
+        await asyncio.sleep(duration)
+        stop.set()
+        summarize("login storm", await during)
+        print(f"logins completed: {sum(await asyncio.gather(*storm))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.logins, args.duration))
@@ -0,0 +1,131 @@
+"""Bulk-load users and tasks with COPY, with a skewed number of tasks per user.
+
+Usage: python -m scripts.seed_db [--users 10000] [--tasks 1000000] [--skew 1.1] [--batch 50000] [--prefix seed] [--seed 42] [--truncate]
+
+Writes to DATABASE_URL. Task counts follow a Zipf-like law over randomly ranked users, so a few
+accounts own tens of thousands of tasks while most own a handful, as in production. Every seeded
+user logs in as <prefix><n>@example.com with SEED_PASSWORD, which scripts.loadtest expects.
+task_counters are rebuilt for the seeded users; run rebuild_reminder_schedule afterwards if the
+reminder queue should include them. --truncate empties users and everything that references them.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime, timedelta, timezone
+import asyncpg
+from app.core.config import settings
+from app.core.security import hash_password
+
+SEED_PASSWORD = "Password123"
+
+USER_COLUMNS = ["email", "username", "hashed_password", "full_name", "role", "is_active", "is_verified", "created_at", "updated_at"]
+TASK_COLUMNS = ["title", "description", "status", "priority", "due_date", "is_archived", "owner_id", "created_at", "updated_at"]
+
+VERBS = ["Review", "Draft", "Deploy", "Fix", "Plan", "Update", "Send", "Prepare", "Test", "Migrate", "Archive", "Call"]
+NOUNS = ["invoice", "release", "report", "customer", "contract", "budget", "dashboard", "backup", "roadmap", "newsletter"]
+CONTEXTS = ["for Q3", "before launch", "with finance", "for the team", "in staging", "for onboarding", "after standup", ""]
+STATUSES, STATUS_WEIGHTS = ["pending", "in_progress", "completed"], [45, 20, 35]
+PRIORITIES, PRIORITY_WEIGHTS = ["low", "medium", "high"], [25, 55, 20]
+
+
+def owner_weights(count: int, skew: float, rng: random.Random) -> list[float]:
+    """Cumulative Zipf weights for `count` users, in a random order so load does not follow user ids."""
+    weights = [1 / (rank + 1) ** skew for rank in range(count)]
+    rng.shuffle(weights)
+    return list(itertools.accumulate(weights))
+
+
+def task_record(owner_id: int, now: datetime, rng: random.Random) -> tuple:
+    created_at = now - timedelta(seconds=rng.randrange(365 * 86400))
+    updated_at = min(now, created_at + timedelta(seconds=rng.randrange(30 * 86400)))
+    status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+    priority = rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0]
+    title = f"{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(CONTEXTS)}".strip()
+    description = f"{title}. Follow up on the {rng.choice(NOUNS)} and the {rng.choice(NOUNS)}." if rng.random() < 0.6 else None
+    due_date = created_at + timedelta(days=rng.randrange(1, 90)) if rng.random() < 0.5 else None
+    is_archived = status == "completed" and updated_at < now - timedelta(days=settings.ARCHIVE_AFTER_DAYS) and rng.random() < 0.8
+    return (title, description, status, priority, due_date, is_archived, owner_id, created_at, updated_at)
+
+
+async def seed_users(conn: asyncpg.Connection, count: int, prefix: str, now: datetime, rng: random.Random) -> list[int]:
+    hashed = hash_password(SEED_PASSWORD)
+    emails = [f"{prefix}{n}@example.com" for n in range(count)]
+    records = []
+    for n, email in enumerate(emails):
+        created_at = now - timedelta(seconds=rng.randrange(2 * 365 * 86400))
+        records.append((email, f"{prefix}_{n}", hashed, f"Seed User {n}", "user", True, True, created_at, created_at))
+    await conn.copy_records_to_table("users", records=records, columns=USER_COLUMNS)
+    return [row["id"] for row in await conn.fetch("SELECT id FROM users WHERE email = ANY($1::text[]) ORDER BY id", emails)]
+
+
+async def seed_tasks(
+    conn: asyncpg.Connection, owner_ids: list[int], count: int, skew: float, batch: int, now: datetime, rng: random.Random
+):
+    cum_weights = owner_weights(len(owner_ids), skew, rng)
+    written = 0
+    while written < count:
+        size = min(batch, count - written)
+        owners = rng.choices(owner_ids, cum_weights=cum_weights, k=size)
+        await conn.copy_records_to_table("tasks", records=[task_record(owner_id, now, rng) for owner_id in owners], columns=TASK_COLUMNS)
+        written += size
+        print(f"  {written}/{count} tasks")
+
+
+async def main(users: int, tasks: int, skew: float, batch: int, prefix: str, seed: int, truncate: bool):
+    if settings.ENVIRONMENT == "production":
+        raise SystemExit("Refusing to seed a production database")
+    if tasks and not users:
+        raise SystemExit("Tasks need at least one seeded user to own them")
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    conn = await asyncpg.connect(settings.DATABASE_URL.replace("+asyncpg", ""))
+    try:
+        if truncate:
+            await conn.execute("TRUNCATE users, task_events RESTART IDENTITY CASCADE")
+            print("🧹 Truncated users, tasks, counters and events")
+
+        started = time.monotonic()
+        owner_ids = await seed_users(conn, users, prefix, now, rng)
+        print(f"👤 {len(owner_ids)} users in {time.monotonic() - started:.1f}s")
+
+        started = time.monotonic()
+        await seed_tasks(conn, owner_ids, tasks, skew, batch, now, rng)
+        elapsed = time.monotonic() - started
+        print(f"📝 {tasks} tasks in {elapsed:.1f}s ({tasks / elapsed if elapsed else 0:.0f} rows/s)")
+
+        await conn.execute(
+            """
+            INSERT INTO task_counters (owner_id, status, priority, is_archived, count)
+            SELECT owner_id, status, priority, is_archived, count(*)
+            FROM tasks
+            WHERE owner_id = ANY($1::int[])
+            GROUP BY 1, 2, 3, 4
+            """,
+            owner_ids,
+        )
+        await conn.execute("ANALYZE users")
+        await conn.execute("ANALYZE tasks")
+        await conn.execute("ANALYZE task_counters")
+
+        per_owner = "SELECT count(*) AS n FROM tasks WHERE owner_id = ANY($1::int[]) GROUP BY owner_id ORDER BY n"
+        sizes = [row["n"] for row in await conn.fetch(per_owner, owner_ids)]
+        if sizes:
+            print(f"📊 tasks per user with any: median={sizes[len(sizes) // 2]} p99={sizes[int(len(sizes) * 0.99)]} max={sizes[-1]}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent; 0 spreads tasks evenly")
+    parser.add_argument("--batch", type=int, default=50_000, help="rows per COPY")
+    parser.add_argument("--prefix", default="seed", help="email/username prefix; change it to seed again without --truncate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.tasks, args.skew, args.batch, args.prefix, args.seed, args.truncate))
@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy import update
+from app.models.task import Task
 
 
 @pytest.mark.asyncio
@@ -31,3 +33,137 @@ async def test_delete_task(client, auth_headers):
     task_id = create.json()["id"]
     assert (await client.delete(f"/api/v1/tasks/{task_id}", headers=auth_headers)).status_code == 204
     assert (await client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination(client, auth_headers):
+    for i in range(3):
+        await client.post("/api/v1/tasks/", json={"title": f"Cursor task {i}"}, headers=auth_headers)
+    first = await client.get("/api/v1/tasks/", params={"pagination": "cursor", "per_page": 2, "count": "none"}, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.json()["total"] is None
+    assert len(first.json()["tasks"]) == 2
+    second = await client.get("/api/v1/tasks/", params={"cursor": first.json()["next_cursor"], "per_page": 2}, headers=auth_headers)
+    assert second.status_code == 200
+    seen = {t["id"] for t in first.json()["tasks"]}
+    assert not seen & {t["id"] for t in second.json()["tasks"]}
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cache_invalidated_on_write(client, auth_headers):
+    before = (await client.get("/api/v1/tasks/", headers=auth_headers)).json()["total"]
+    await client.post("/api/v1/tasks/", json={"title": "Fresh task"}, headers=auth_headers)
+    after = (await client.get("/api/v1/tasks/", headers=auth_headers)).json()["total"]
+    assert after == before + 1
+
+
+@pytest.mark.asyncio
+async def test_get_task_cache_hit_returns_same_body(client, auth_headers):
+    task_id = (await client.post("/api/v1/tasks/", json={"title": "Cached"}, headers=auth_headers)).json()["id"]
+    first = await client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers)
+    second = await client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers)
+    assert second.status_code == 200
+    assert second.json()["title"] == "Cached"
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_304_until_task_changes(client, auth_headers):
+    task_id = (await client.post("/api/v1/tasks/", json={"title": "Poll me"}, headers=auth_headers)).json()["id"]
+    etag = (await client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers)).headers["etag"]
+    unchanged = await client.get(f"/api/v1/tasks/{task_id}", headers={**auth_headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    list_etag = (await client.get("/api/v1/tasks/", headers=auth_headers)).headers["etag"]
+    assert (await client.get("/api/v1/tasks/", headers={**auth_headers, "If-None-Match": list_etag})).status_code == 304
+
+    await client.patch(f"/api/v1/tasks/{task_id}", json={"status": "in_progress"}, headers=auth_headers)
+    assert (await client.get(f"/api/v1/tasks/{task_id}", headers={**auth_headers, "If-None-Match": etag})).status_code == 200
+    assert (await client.get("/api/v1/tasks/", headers={**auth_headers, "If-None-Match": list_etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_etag_survives_writes_that_leave_the_page_unchanged(client, auth_headers):
+    url = "/api/v1/tasks/?status=completed"
+    etag = (await client.get(url, headers=auth_headers)).headers["etag"]
+    await client.post("/api/v1/tasks/", json={"title": "Still pending"}, headers=auth_headers)
+    assert (await client.get(url, headers={**auth_headers, "If-None-Match": etag})).status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_invalid_items(client, auth_headers):
+    items = [{"title": "Imported 1"}, {"priority": "high"}, {"title": "Imported 2", "priority": "low"}]
+    response = await client.post("/api/v1/tasks/bulk", json=items, headers=auth_headers)
+    assert response.status_code == 200
+    assert [t["title"] for t in response.json()["tasks"]] == ["Imported 1", "Imported 2"]
+    assert [e["index"] for e in response.json()["errors"]] == [1]
+    assert response.json()["errors"][0]["errors"][0]["loc"] == ["title"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_and_archive(client, auth_headers):
+    created = (await client.post("/api/v1/tasks/bulk", json=[{"title": "A"}, {"title": "B"}], headers=auth_headers)).json()["tasks"]
+    ids = [t["id"] for t in created]
+    items = [{"id": ids[0], "status": "completed"}, {"id": ids[1], "status": "completed"}, {"id": 999999, "status": "completed"}]
+    updated = await client.patch("/api/v1/tasks/bulk", json=items, headers=auth_headers)
+    assert {t["status"] for t in updated.json()["tasks"]} == {"completed"}
+    assert [e["id"] for e in updated.json()["errors"]] == [999999]
+    assert updated.json()["errors"][0]["errors"] == [{"type": "not_found", "loc": ["id"], "msg": "Task not found"}]
+
+    archived = await client.post("/api/v1/tasks/bulk/archive", json={"ids": ids}, headers=auth_headers)
+    assert all(t["is_archived"] for t in archived.json()["tasks"])
+
+
+@pytest.mark.asyncio
+async def test_export_streams_csv(client, auth_headers):
+    response = await client.get("/api/v1/tasks/export", params={"format": "csv"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].startswith("title,description,priority")
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_counters_through_writes(client, auth_headers):
+    before = (await client.get("/api/v1/tasks/stats", headers=auth_headers)).json()
+    created = await client.post("/api/v1/tasks/", json={"title": "Counted", "priority": "high"}, headers=auth_headers)
+    task_id = created.json()["id"]
+    await client.patch(f"/api/v1/tasks/{task_id}", json={"status": "in_progress"}, headers=auth_headers)
+
+    stats = (await client.get("/api/v1/tasks/stats", headers=auth_headers)).json()
+    assert stats["total"] == before["total"] + 1
+    assert stats["by_status"]["in_progress"] == before["by_status"].get("in_progress", 0) + 1
+    assert stats["by_priority"]["high"] == before["by_priority"].get("high", 0) + 1
+    assert (await client.get("/api/v1/tasks/", headers=auth_headers)).json()["total"] == stats["total"]
+
+    await client.delete(f"/api/v1/tasks/{task_id}", headers=auth_headers)
+    assert (await client.get("/api/v1/tasks/stats", headers=auth_headers)).json()["total"] == before["total"]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_title_matches_and_paginates(client, auth_headers):
+    renewal = {"title": "Renew certificate", "description": "Invoice arrives after renewal"}
+    await client.post("/api/v1/tasks/", json=renewal, headers=auth_headers)
+    await client.post("/api/v1/tasks/", json={"title": "Pay supplier invoices"}, headers=auth_headers)
+    await client.post("/api/v1/tasks/", json={"title": "Water the plants"}, headers=auth_headers)
+
+    first = await client.get("/api/v1/tasks/search", params={"q": "invoice", "per_page": 1}, headers=auth_headers)
+    assert first.status_code == 200
+    assert [t["title"] for t in first.json()["tasks"]] == ["Pay supplier invoices"]
+    second = await client.get("/api/v1/tasks/search", params={"q": "invoice", "cursor": first.json()["next_cursor"]}, headers=auth_headers)
+    assert [t["title"] for t in second.json()["tasks"]] == ["Renew certificate"]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_null_counted_fields_are_rejected_and_legacy_nulls_still_update(client, auth_headers, db):
+    task_id = (await client.post("/api/v1/tasks/", json={"title": "Legacy"}, headers=auth_headers)).json()["id"]
+    rejected = await client.patch(f"/api/v1/tasks/{task_id}", json={"status": None}, headers=auth_headers)
+    assert rejected.status_code == 422
+
+    # Rows written before the columns had defaults can still hold NULLs.
+    await db.execute(update(Task).where(Task.id == task_id).values(priority=None))
+    updated = await client.patch(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers=auth_headers)
+    assert updated.status_code == 200
+    assert (await client.delete(f"/api/v1/tasks/{task_id}", headers=auth_headers)).status_code == 204
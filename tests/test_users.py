@@ -0,0 +1,17 @@
+import pytest
+from app.core.security import hash_password
+from app.models.user import User
+
+
+@pytest.mark.asyncio
+async def test_deactivation_evicts_cached_principal(client, db, auth_headers, test_user):
+    admin = User(email="admin@example.com", username="adminuser", hashed_password=hash_password("Password123"), role="admin")
+    db.add(admin)
+    await db.flush()
+    login = await client.post("/api/v1/auth/login", json={"email": "admin@example.com", "password": "Password123"})
+    admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    assert (await client.get("/api/v1/tasks/", headers=auth_headers)).status_code == 200
+    response = await client.patch(f"/api/v1/users/{test_user.id}", json={"is_active": False}, headers=admin_headers)
+    assert response.status_code == 200
+    assert (await client.get("/api/v1/tasks/", headers=auth_headers)).status_code == 404
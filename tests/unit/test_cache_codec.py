@@ -0,0 +1,31 @@
+import json
+from datetime import datetime, timezone
+import pytest
+from app.core.cache_codec import CacheCodec, CacheDecodeError
+
+PAYLOAD = {"tasks": [{"id": i, "title": f"Task {i}", "description": "x" * 200} for i in range(20)], "total": 20}
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+def test_round_trip(compression):
+    codec = CacheCodec("msgpack", compression, threshold=512)
+    encoded = codec.encode(PAYLOAD)
+    assert encoded[0] < 0x20
+    assert codec.decode(encoded) == PAYLOAD
+    if compression != "none":
+        assert len(encoded) < len(json.dumps(PAYLOAD))
+
+
+def test_datetimes_are_encoded_as_iso_strings():
+    created_at = datetime(2026, 2, 17, 17, 33, tzinfo=timezone.utc)
+    assert CacheCodec().decode(CacheCodec().encode({"created_at": created_at})) == {"created_at": created_at.isoformat()}
+
+
+def test_reads_legacy_json_entries():
+    assert CacheCodec().decode(json.dumps(PAYLOAD).encode()) == PAYLOAD
+    assert CacheCodec("json").encode(PAYLOAD) == json.dumps(PAYLOAD).encode()
+
+
+def test_rejects_unknown_format():
+    with pytest.raises(CacheDecodeError):
+        CacheCodec().decode(b"\x1f\x00")
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+import pytest
+from app.core import database
+from app.core.redis_client import RedisClient, version_key
+from app.utils.local_cache import LocalCache
+
+
+class RecordingPipeline:
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.server.round_trips += 1
+        self.server.executed.extend(self.commands)
+        for name, args in self.commands:
+            if name == "setex":
+                self.server.data[args[0]] = args[2]
+        return [True] * len(self.commands)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.executed = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return RecordingPipeline(self)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+
+@pytest.fixture
+def cache():
+    client = RedisClient()
+    client._client = FakeRedis()
+    client._local = LocalCache(100, ttl=60)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_writes_and_invalidation_in_one_round_trip(cache):
+    cache._local.set("task:1", {"title": "old"})
+    async with cache.pipeline() as pipe:
+        pipe.delete("task:1", "task:2")
+        pipe.bump_version("tasks:user:7")
+        pipe.zadd("reminders:due", {"1": 100.0})
+        pipe.zrem("reminders:due")
+    assert cache._client.round_trips == 1
+    assert [name for name, _ in cache._client.executed] == ["delete", "incr", "zadd", "publish"]
+    assert cache._local.get("task:1") is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_nothing_when_the_block_fails(cache):
+    with pytest.raises(RuntimeError):
+        async with cache.pipeline() as pipe:
+            pipe.bump_version("tasks:user:7")
+            raise RuntimeError
+    assert cache._client.round_trips == 0
+
+
+@pytest.mark.asyncio
+async def test_mset_then_mget_reads_missing_keys_in_one_call(cache):
+    await cache.mset_with_ttl({"task:1": {"id": 1}, "task:2": {"id": 2}}, ttl=30)
+    cache._local.clear()
+    cache._local.set(version_key("tasks:user:7"), 3)
+    round_trips = cache._client.round_trips
+    assert await cache.mget([version_key("tasks:user:7"), "task:1", "task:9", "task:2"]) == [3, {"id": 1}, None, {"id": 2}]
+    assert cache._client.round_trips == round_trips + 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_sent_only_after_commit(cache, monkeypatch):
+    monkeypatch.setattr(database, "redis_client", cache)
+    session = SimpleNamespace(info={})
+    database.pipeline_after_commit(session, lambda pipe: pipe.bump_version("tasks:user:1"))
+    assert cache._client.executed == []
+    await database.run_after_commit(session)
+    assert cache._client.executed[0] == ("incr", (version_key("tasks:user:1"),))
+    assert session.info == {}
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import time
+import pytest
+from app.core.redis_client import RedisClient
+
+
+class InMemoryRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        return True
+
+
+@pytest.fixture
+def cache():
+    client = RedisClient()
+    client._client = InMemoryRedis()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(cache):
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"total": 3}
+
+    results = await asyncio.gather(*(cache.get_or_load("tasks:user:1:v0", load, ttl=60) for _ in range(50)))
+    assert calls == 1
+    assert all(r == {"total": 3} for r in results)
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_one_caller_refreshes(cache):
+    cache._client.data["task:1"] = json.dumps({"value": "old", "fresh_until": time.time() - 1}).encode()
+    refreshed = asyncio.Event()
+
+    async def load():
+        await refreshed.wait()
+        return "new"
+
+    leader = asyncio.create_task(cache.get_or_load("task:1", load, ttl=60, stale_ttl=30))
+    await asyncio.sleep(0)
+    assert await cache.get_or_load("task:1", load, ttl=60, stale_ttl=30) == "old"
+    refreshed.set()
+    assert await leader == "new"
+    assert await cache.get_or_load("task:1", load, ttl=60, stale_ttl=30) == "new"
@@ -0,0 +1,24 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+
+def sample(name: str, pool: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0.0
+
+
+def test_instrumented_engine_records_occupancy_and_query_timings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=QueuePool, pool_size=2, max_overflow=3)
+    instrument_engine(engine, "unit")
+    assert sample("db_pool_max_connections", "unit") == 5
+
+    with engine.connect() as conn:
+        assert sample("db_pool_connections_in_use", "unit") == 1
+        conn.execute(text("select 1"))
+    assert sample("db_pool_connections_in_use", "unit") == 0
+    assert sample("db_query_seconds_count", "unit") == 1
+    assert sample("db_slow_queries_total", "unit") == 1
+    engine.dispose()
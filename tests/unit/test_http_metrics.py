@@ -0,0 +1,39 @@
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from app.core.metrics import PrometheusMiddleware, cache_key_family, instrument_engine
+
+
+def test_cache_key_family():
+    assert cache_key_family("tasks:user:7:v3:p1") == "tasks:user:"
+    assert cache_key_family("task:42") == "task:"
+    assert cache_key_family("something:else") == "other"
+
+
+async def test_middleware_labels_by_route_template_and_counts_queries(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'http.db'}", poolclass=QueuePool)
+    instrument_engine(engine, "http-unit")
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/widgets/{widget_id}")
+    def get_widget(widget_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+        return {"id": widget_id}
+
+    labels = {"method": "GET", "route": "/widgets/{widget_id}", "status": "200"}
+    before = REGISTRY.get_sample_value("http_requests_total", labels) or 0
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/widgets/1")).status_code == 200
+        assert (await client.get("/widgets/2")).status_code == 200
+        assert (await client.get("/nowhere")).status_code == 404
+
+    assert REGISTRY.get_sample_value("http_requests_total", labels) == before + 2
+    assert REGISTRY.get_sample_value("http_request_db_queries_sum", {"route": "/widgets/{widget_id}"}) == 4
+    assert REGISTRY.get_sample_value("http_requests_total", {"method": "GET", "route": "unmatched", "status": "404"}) >= 1
+    assert REGISTRY.get_sample_value("http_requests_in_progress", {"method": "GET"}) == 0
+    engine.dispose()
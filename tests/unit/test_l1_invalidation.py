@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from app.core.redis_client import INVALIDATION_CHANNEL, RedisClient, version_key
+from app.utils.local_cache import LocalCache
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.subscribers.setdefault(channel, []).append(self)
+
+    async def listen(self):
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+    async def aclose(self):
+        for subscribers in self.server.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakeServer:
+    """One Redis shared by every client: plain keys plus pub/sub fan-out."""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        for pubsub in self.subscribers.get(channel, []):
+            pubsub.queue.put_nowait({"type": "message", "channel": channel, "data": data})
+        return len(self.subscribers.get(channel, []))
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    def disconnect(self):
+        for pubsub in self.subscribers.get(INVALIDATION_CHANNEL, []):
+            pubsub.queue.put_nowait(ConnectionError("connection reset"))
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest_asyncio.fixture
+async def workers():
+    server = FakeServer()
+    clients = []
+    for _ in range(2):
+        client = RedisClient()
+        client._client = client._blocking = server
+        client._local = LocalCache(100, ttl=60)
+        client._listener = asyncio.create_task(client._listen_invalidations())
+        clients.append(client)
+    await settle()
+    yield server, clients
+    for client in clients:
+        client._listener.cancel()
+    await settle()
+
+
+@pytest.mark.asyncio
+async def test_set_on_one_worker_evicts_the_other_workers_l1_entry(workers):
+    _, (a, b) = workers
+    await a.set("task:1", {"title": "old"})
+    assert await b.get("task:1") == {"title": "old"}
+    assert b._local.get("task:1") == {"title": "old"}
+
+    await a.set("task:1", {"title": "new"})
+    await settle()
+    assert b._local.get("task:1") is None
+    assert await b.get("task:1") == {"title": "new"}
+    # A worker ignores its own messages, so the value it just wrote stays in its L1.
+    assert a._local.get("task:1") == {"title": "new"}
+
+
+@pytest.mark.asyncio
+async def test_bump_version_evicts_the_cached_generation_everywhere(workers):
+    _, (a, b) = workers
+    await a.bump_version("tasks:user:1")
+    assert await b.get_version("tasks:user:1") == 1
+    assert b._local.get(version_key("tasks:user:1")) is not None
+
+    await a.bump_version("tasks:user:1")
+    await settle()
+    assert b._local.get(version_key("tasks:user:1")) is None
+    assert await b.get_version("tasks:user:1") == 2
+
+
+@pytest.mark.asyncio
+async def test_l1_is_cleared_when_the_subscription_drops(workers):
+    server, (a, b) = workers
+    b._local.set("task:1", {"title": "maybe stale"})
+    server.disconnect()
+    await settle()
+    assert len(b._local) == 0
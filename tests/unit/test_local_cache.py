@@ -0,0 +1,21 @@
+import time
+from app.utils.local_cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    cache = LocalCache(max_entries=10, ttl=5)
+    cache.set("a", 1, ttl=300)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("a") is None
+    assert len(cache) == 0
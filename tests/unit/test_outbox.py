@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+from app.tasks.outbox_tasks import group_events_by_owner
+
+
+def test_events_grouped_per_owner_in_commit_order():
+    at = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    rows = [
+        (1, 7, 100, "created", at),
+        (2, 8, 200, "created", at),
+        (3, 7, 100, "updated", at),
+        (4, 7, 101, "deleted", at),
+    ]
+    grouped = group_events_by_owner(rows)
+    assert list(grouped) == [7, 8]
+    assert [(e["task_id"], e["event"]) for e in grouped[7]] == [(100, "created"), (100, "updated"), (101, "deleted")]
+    assert grouped[8] == [{"task_id": 200, "event": "created", "at": at.isoformat()}]
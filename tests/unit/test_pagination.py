@@ -0,0 +1,14 @@
+import pytest
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2026-02-17T17:33:13.123456+00:00", 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2026-02-17T17:33:13.123456+00:00", 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(1, 2, 3), encode_cursor()])
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, 2)
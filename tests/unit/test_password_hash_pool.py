@@ -0,0 +1,33 @@
+import asyncio
+import time
+import pytest
+from app.core.security import PasswordHashBusy, PasswordHashPool
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_event_loop_responsive():
+    pool = PasswordHashPool(workers=2, max_pending=8)
+    lag = 0.0
+
+    async def ticker():
+        nonlocal lag
+        for _ in range(10):
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - start - 0.01)
+
+    await asyncio.gather(ticker(), *(pool.run(time.sleep, 0.05) for _ in range(4)))
+    assert lag < 0.04
+    assert pool.stats()["completed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_beyond_max_pending():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    running = [asyncio.create_task(pool.run(time.sleep, 0.05)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert pool.stats()["queued"] == 1
+    with pytest.raises(PasswordHashBusy):
+        await pool.run(time.sleep, 0.05)
+    await asyncio.gather(*running)
+    assert pool.stats()["rejected"] == 1
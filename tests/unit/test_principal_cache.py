@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.dependencies import get_current_principal
+from app.core.redis_client import redis_client
+from app.core.security import create_access_token
+
+
+class UserLookup:
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.user)
+
+
+@pytest.mark.asyncio
+async def test_principal_falls_back_to_the_database_when_redis_is_down(monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(redis_client, "get", unavailable)
+    monkeypatch.setattr(redis_client, "set", unavailable)
+    db = UserLookup(SimpleNamespace(id=42, role="user", is_active=True, updated_at=None))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(42))
+    principal = await get_current_principal(credentials, db)
+    assert (principal.id, principal.role) == (42, "user")
+    assert db.queries == 1
@@ -0,0 +1,69 @@
+import time
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import LocalTokenBuckets, RateLimiter, RateLimitMiddleware, client_identity
+from app.core.redis_client import redis_client
+from app.core.security import create_access_token
+
+
+def test_local_bucket_refills_over_the_period(monkeypatch):
+    buckets = LocalTokenBuckets(max_entries=10)
+    assert buckets.take("k", 2, 60)[0] == 1
+    assert buckets.take("k", 2, 60)[0] == 1
+    allowed, remaining, retry_after = buckets.take("k", 2, 60)
+    assert (allowed, remaining) == (0, 0)
+    assert 29_000 < retry_after <= 30_000
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert buckets.take("k", 2, 60)[0] == 1
+
+
+def test_identity_prefers_user_over_ip_except_on_auth_routes():
+    token = create_access_token(42)
+    scope = {"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())], "client": ("10.0.0.1", 5000)}
+    assert client_identity(scope, "tasks") == "user:42"
+    assert client_identity(scope, "auth") == "ip:10.0.0.1"
+    assert client_identity({**scope, "headers": []}, "tasks") == "ip:10.0.0.1"
+
+
+def test_forwarded_clients_get_separate_buckets_only_behind_a_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["172.16.0.0/12"])
+
+    def forwarded(peer: str, forwarded_for: str) -> dict:
+        return {"type": "http", "headers": [(b"x-forwarded-for", forwarded_for.encode())], "client": (peer, 5000)}
+
+    first = client_identity(forwarded("172.18.0.5", "203.0.113.7"), "auth")
+    second = client_identity(forwarded("172.18.0.5", "198.51.100.9"), "auth")
+    assert (first, second) == ("ip:203.0.113.7", "ip:198.51.100.9")
+    # A spoofed leading hop is ignored: the proxy appended the real peer after it.
+    assert client_identity(forwarded("172.18.0.5", "1.2.3.4, 203.0.113.7"), "auth") == "ip:203.0.113.7"
+    # Headers from untrusted peers are not believed.
+    assert client_identity(forwarded("203.0.113.7", "1.2.3.4"), "auth") == "ip:203.0.113.7"
+    real_ip = {"type": "http", "headers": [(b"x-real-ip", b"203.0.113.8")], "client": ("172.18.0.5", 5000)}
+    assert client_identity(real_ip, "auth") == "ip:203.0.113.8"
+
+
+@pytest.mark.asyncio
+async def test_middleware_falls_back_to_local_limits_without_redis(monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(redis_client, "run_script", unavailable)
+    monkeypatch.setattr(rate_limit, "rate_limiter", RateLimiter())
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TASKS", "2/minute")
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+    app.get(f"{settings.API_V1_STR}/tasks/ping")(lambda: {"ok": True})
+    app.get("/health")(lambda: {"ok": True})
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        responses = [await client.get(f"{settings.API_V1_STR}/tasks/ping") for _ in range(3)]
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0].headers["x-ratelimit-remaining"] == "1"
+        assert int(responses[2].headers["retry-after"]) == 30
+        assert (await client.get("/health")).status_code == 200
+    assert rate_limit.rate_limiter.stats()["backend"] == "local"
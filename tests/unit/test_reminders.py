@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.core.config import settings
+from app.services.task_service import needs_reminder, reminder_score
+
+
+def make_task(due_in: timedelta, status: str = "pending"):
+    return SimpleNamespace(id=1, due_date=datetime.now(timezone.utc) + due_in, status=status, is_archived=False)
+
+
+def test_reminder_goes_out_lead_minutes_before_due():
+    task = make_task(timedelta(days=1))
+    expected = task.due_date.timestamp() - settings.REMINDER_LEAD_MINUTES * 60
+    assert needs_reminder(task)
+    assert abs(reminder_score(task) - expected) < 1e-6
+
+
+def test_open_window_only_rescheduled_on_catch_up():
+    task = make_task(timedelta(minutes=settings.REMINDER_LEAD_MINUTES / 2))
+    assert needs_reminder(task)
+    assert reminder_score(task) is None
+    assert reminder_score(task, catch_up=True) is not None
+
+
+def test_closed_tasks_need_no_reminder():
+    assert not needs_reminder(make_task(timedelta(days=1), status="completed"))
+    assert not needs_reminder(SimpleNamespace(due_date=None, status="pending", is_archived=False))
+    assert not needs_reminder(make_task(-timedelta(minutes=1)))
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.database import ReplicaRouter
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_handed_out_unconnected_and_failed_replicas_skipped_until_retry():
+    engines = [create_async_engine("postgresql+asyncpg://postgres@127.0.0.1:1/replica") for _ in range(2)]
+    router = ReplicaRouter(engines)
+    for _ in range(2):
+        session = router.session()
+        assert session is not None
+        with pytest.raises(OSError):
+            async with router.use(session):
+                await session.execute(text("SELECT 1"))
+    assert router.session() is None
+    assert router.stats() == {"replicas": 2, "healthy": 0}
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_query_errors_do_not_mark_a_replica_down():
+    engines = [create_async_engine("postgresql+asyncpg://postgres@127.0.0.1:1/replica")]
+    router = ReplicaRouter(engines)
+    with pytest.raises(ValueError):
+        async with router.use(router.session()):
+            raise ValueError("bad request")
+    assert router.stats() == {"replicas": 1, "healthy": 1}
+    await engines[0].dispose()
+
+
+def test_no_replicas_means_no_replica_session():
+    router = ReplicaRouter([])
+    assert router.session() is None
+    assert router.stats() == {"replicas": 0, "healthy": 0}
@@ -0,0 +1,10 @@
+from sqlalchemy.dialects import postgresql
+from app.models.task import Task
+from app.tasks.report_tasks import shard_owners
+
+
+def test_shards_filter_users_so_tasks_are_read_through_the_owner_index():
+    sql = str(Task.owner_id.in_(shard_owners(3, 8)).compile(dialect=postgresql.dialect()))
+    assert "tasks.owner_id IN (SELECT users.id" in sql
+    assert "users.id %" in sql
+    assert "tasks.owner_id %" not in sql
@@ -0,0 +1,27 @@
+import json
+import pytest
+from starlette.requests import Request
+from app.core.cache_codec import CacheCodec
+from app.schemas.task import TaskStatsResponse
+from app.utils.responses import cached_response, encode_body, etag_matches, make_etag
+
+
+def request_with(if_none_match: str) -> Request:
+    return Request({"type": "http", "headers": [(b"if-none-match", if_none_match.encode())]})
+
+
+def test_etag_matches_any_listed_tag():
+    etag = make_etag("task", 1, "2026-02-17T17:33:13+00:00")
+    assert etag_matches(request_with(f'"other", W/{etag}'), etag)
+    assert etag_matches(request_with("*"), etag)
+    assert not etag_matches(request_with(make_etag("task", 1, "2026-02-18T00:00:00+00:00")), etag)
+
+
+@pytest.mark.parametrize("serializer", ["json", "msgpack"])
+def test_cached_entry_survives_each_codec(serializer):
+    entry = encode_body(TaskStatsResponse(total=3, by_status={"pending": 3}, by_priority={"medium": 3}, archived=0), owner_id=7)
+    codec = CacheCodec(serializer)
+    response = cached_response(codec.decode(codec.encode(entry)))
+    assert response.body == entry["body"].encode()
+    assert json.loads(response.body)["total"] == 3
+    assert response.headers["etag"] == entry["etag"]
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from app.utils.sse import EventStreamResponse, StreamSlots, sse_comment, sse_frame, stream_id_key
+
+
+def test_frame_fields_and_multiline_data():
+    frame = sse_frame('{"a": 1}\n{"b": 2}', event="updated", id="1700000000000-3")
+    assert frame == 'id: 1700000000000-3\nevent: updated\ndata: {"a": 1}\ndata: {"b": 2}\n\n'
+    assert sse_frame(retry=3000) == "retry: 3000\n\n"
+    assert sse_comment("heartbeat") == ": heartbeat\n\n"
+
+
+def test_stream_ids_compare_numerically():
+    assert stream_id_key("1700000000000-10") > stream_id_key("1700000000000-9")
+    assert stream_id_key("1700000000001") > stream_id_key("1700000000000-99")
+    with pytest.raises(ValueError):
+        stream_id_key("not-an-id")
+
+
+def test_slots_reject_beyond_limit_until_released():
+    slots = StreamSlots(limit=2)
+    assert slots.try_acquire() and slots.try_acquire()
+    assert not slots.try_acquire()
+    slots.release()
+    assert slots.try_acquire()
+    assert slots.stats() == {"limit": 2, "open": 2, "served": 3, "rejected": 1}
+
+
+@pytest.mark.asyncio
+async def test_slot_is_released_when_the_client_disconnects_before_the_first_frame():
+    slots = StreamSlots(limit=1)
+    started = []
+
+    async def events():
+        started.append(True)
+        yield sse_comment("hello")
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        await asyncio.sleep(0)
+
+    assert slots.try_acquire()
+    await EventStreamResponse(events(), slots)({"type": "http", "asgi": {"spec_version": "2.3"}}, receive, send)
+    assert started == []
+    assert slots.stats()["open"] == 0
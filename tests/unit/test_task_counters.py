@@ -0,0 +1,21 @@
+from types import SimpleNamespace
+import pytest
+from pydantic import ValidationError
+from app.schemas.task import TaskBulkUpdateItem, TaskUpdate
+from app.services.task_service import counter_bucket, counter_deltas
+
+
+def test_null_columns_count_as_defaults():
+    legacy = SimpleNamespace(owner_id=1, status=None, priority=None, is_archived=None)
+    assert counter_bucket(legacy) == (1, "pending", "medium", False)
+    deltas = counter_deltas(removed=[counter_bucket(legacy)], added=[(1, "pending", "medium", False)])
+    assert all(delta == 0 for delta in deltas.values())
+
+
+@pytest.mark.parametrize("field", ["status", "priority", "is_archived"])
+def test_counted_fields_cannot_be_set_to_null(field):
+    with pytest.raises(ValidationError):
+        TaskUpdate.model_validate({field: None})
+    with pytest.raises(ValidationError):
+        TaskBulkUpdateItem.model_validate({"id": 1, field: None})
+    assert TaskUpdate.model_validate({"description": None}).model_dump(exclude_unset=True) == {"description": None}
@@ -0,0 +1,33 @@
+import time
+from datetime import timedelta
+from jose import jwt
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+def test_cached_decode_respects_expiry(monkeypatch):
+    token = create_access_token(7, expires_delta=timedelta(seconds=30))
+    assert decode_token(token)["sub"] == "7"
+    assert token_cache.get(token) is not None
+    monotonic = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: monotonic + 31)
+    assert token_cache.get(token) is None
+
+
+def test_decode_throughput_benchmark():
+    token = create_access_token(1)
+    iterations = 2000
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    uncached = iterations / (time.perf_counter() - start)
+
+    token_cache.clear()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_token(token)
+    cached = iterations / (time.perf_counter() - start)
+
+    print(f"\njwt decode: {uncached:,.0f}/s uncached, {cached:,.0f}/s through the token cache")
+    assert cached > uncached * 5